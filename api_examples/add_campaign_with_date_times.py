@@ -19,13 +19,31 @@ This feature was added in v23 of the Google Ads API.
 """
 
 import argparse
+import functools
+import io
 import sys
 import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 
 from google.ads.googleads.client import GoogleAdsClient
 from google.ads.googleads.errors import GoogleAdsException
 
+# The maximum number of concurrent mutate requests when creating campaigns for
+# several customers, to stay under the per-developer QPS limit.
+_MAX_WORKERS = 8
+
+
+@functools.lru_cache(maxsize=None)
+def _get_service(client, name):
+    """Returns the named service client, created once per client instance.
+
+    Args:
+        client: an initialized GoogleAdsClient instance.
+        name: the name of the service, e.g. "CampaignService".
+    """
+    return client.get_service(name)
+
 
 def main(client, customer_id):
     """The main method that creates all necessary entities for the example.
@@ -34,8 +52,84 @@ def main(client, customer_id):
         client: an initialized GoogleAdsClient instance.
         customer_id: a client customer ID.
     """
-    campaign_budget_service = client.get_service("CampaignBudgetService")
-    campaign_service = client.get_service("CampaignService")
+    try:
+        campaign_budget_resource_name = _add_campaign_budget(client, customer_id)
+        _add_campaign(client, customer_id, campaign_budget_resource_name)
+    except GoogleAdsException as ex:
+        _handle_google_ads_exception(ex)
+
+
+def add_campaigns_for_customers(client, customer_ids):
+    """Creates a budget and a campaign for each of several customers.
+
+    Budget mutates for all customers are issued concurrently, and each
+    customer's campaign mutate starts as soon as its budget has been created.
+    A failure for one customer is reported without stopping the others; the
+    process exits with status 1 once every customer has been handled.
+
+    Args:
+        client: an initialized GoogleAdsClient instance.
+        customer_ids: a list of client customer IDs.
+    """
+    failed = False
+    max_workers = min(_MAX_WORKERS, len(customer_ids))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        budget_futures = {
+            executor.submit(_report_errors, _add_campaign_budget, client, customer_id): customer_id
+            for customer_id in customer_ids
+        }
+        campaign_futures = []
+        for future in as_completed(budget_futures):
+            campaign_budget_resource_name = future.result()
+            if campaign_budget_resource_name is None:
+                failed = True
+                continue
+            campaign_futures.append(
+                executor.submit(
+                    _report_errors,
+                    _add_campaign,
+                    client,
+                    budget_futures[future],
+                    campaign_budget_resource_name,
+                )
+            )
+        for future in as_completed(campaign_futures):
+            if future.result() is None:
+                failed = True
+    if failed:
+        sys.exit(1)
+
+
+def _report_errors(add_fn, client, customer_id, *args):
+    """Calls add_fn, printing rather than raising a GoogleAdsException.
+
+    Args:
+        add_fn: _add_campaign_budget or _add_campaign.
+        client: an initialized GoogleAdsClient instance.
+        customer_id: a client customer ID.
+        *args: any further arguments for add_fn.
+
+    Returns:
+        The resource name returned by add_fn, or None if the request failed.
+    """
+    try:
+        return add_fn(client, customer_id, *args)
+    except GoogleAdsException as ex:
+        _print_google_ads_exception(ex)
+        return None
+
+
+def _add_campaign_budget(client, customer_id):
+    """Creates a campaign budget.
+
+    Args:
+        client: an initialized GoogleAdsClient instance.
+        customer_id: a client customer ID.
+
+    Returns:
+        The resource name of the created campaign budget.
+    """
+    campaign_budget_service = _get_service(client, "CampaignBudgetService")
 
     # Create a budget, which is a required constraint when creating a campaign.
     campaign_budget_operation = client.get_type("CampaignBudgetOperation")
@@ -47,17 +141,30 @@ def main(client, customer_id):
     campaign_budget.amount_micros = 500000
 
     # Add budget.
-    try:
-        campaign_budget_response = campaign_budget_service.mutate_campaign_budgets(
-            customer_id=customer_id, operations=[campaign_budget_operation]
-        )
-    except GoogleAdsException as ex:
-        _handle_google_ads_exception(ex)
+    campaign_budget_response = campaign_budget_service.mutate_campaign_budgets(
+        customer_id=customer_id, operations=[campaign_budget_operation]
+    )
 
     campaign_budget_resource_name = campaign_budget_response.results[0].resource_name
     print(
         f"Created campaign budget with resource name: '{campaign_budget_resource_name}'"
     )
+    return campaign_budget_resource_name
+
+
+def _add_campaign(client, customer_id, campaign_budget_resource_name):
+    """Creates a paused Search campaign with start and end date times.
+
+    Args:
+        client: an initialized GoogleAdsClient instance.
+        customer_id: a client customer ID.
+        campaign_budget_resource_name: the resource name of the campaign's
+            budget.
+
+    Returns:
+        The resource name of the created campaign.
+    """
+    campaign_service = _get_service(client, "CampaignService")
 
     # Create campaign.
     campaign_operation = client.get_type("CampaignOperation")
@@ -88,39 +195,51 @@ def main(client, customer_id):
     start_time = now + timedelta(days=1)
     end_time = now + timedelta(days=31)
 
-    campaign.start_date_time = start_time.strftime("%Y-%m-%d %H:%M:%S")
-    campaign.end_date_time = end_time.strftime("%Y-%m-%d %H:%M:%S")
+    campaign.start_date_time = start_time.isoformat(sep=" ", timespec="seconds")
+    campaign.end_date_time = end_time.isoformat(sep=" ", timespec="seconds")
 
     # Add the campaign.
-    try:
-        campaign_response = campaign_service.mutate_campaigns(
-            customer_id=customer_id, operations=[campaign_operation]
-        )
-        print(
-            f"Created campaign with resource name: '{campaign_response.results[0].resource_name}'"
-        )
-        print(f"Start date time: {campaign.start_date_time}")
-        print(f"End date time: {campaign.end_date_time}")
-    except GoogleAdsException as ex:
-        _handle_google_ads_exception(ex)
+    campaign_response = campaign_service.mutate_campaigns(
+        customer_id=customer_id, operations=[campaign_operation]
+    )
+    campaign_resource_name = campaign_response.results[0].resource_name
+    print(f"Created campaign with resource name: '{campaign_resource_name}'")
+    print(f"Start date time: {campaign.start_date_time}")
+    print(f"End date time: {campaign.end_date_time}")
+    return campaign_resource_name
 
 
 def _handle_google_ads_exception(exception):
+    """Prints the details of a GoogleAdsException object and exits.
+
+    Args:
+        exception: an instance of GoogleAdsException.
+    """
+    _print_google_ads_exception(exception)
+    sys.exit(1)
+
+
+def _print_google_ads_exception(exception):
     """Prints the details of a GoogleAdsException object.
 
     Args:
         exception: an instance of GoogleAdsException.
     """
-    print(
+    # Bulk failures can carry thousands of errors, so the report is built in
+    # memory and written with a single call.
+    buffer = io.StringIO()
+    buffer.write(
         f"Request with ID '{exception.request_id}' failed with status "
-        f"'{exception.error.code().name}' and includes the following errors:"
+        f"'{exception.error.code().name}' and includes the following errors:\n"
     )
     for error in exception.failure.errors:
-        print(f"\tError with message '{error.message}'.")
+        buffer.write(f"\tError with message '{error.message}'.\n")
         if error.location:
-            for field_path_element in error.location.field_path_elements:
-                print(f"\t\tOn field: {field_path_element.field_name}")
-    sys.exit(1)
+            buffer.writelines(
+                f"\t\tOn field: {field_path_element.field_name}\n"
+                for field_path_element in error.location.field_path_elements
+            )
+    sys.stdout.write(buffer.getvalue())
 
 
 if __name__ == "__main__":
@@ -132,8 +251,9 @@ if __name__ == "__main__":
         "-c",
         "--customer_id",
         type=str,
+        nargs="+",
         required=True,
-        help="The Google Ads customer ID.",
+        help="One or more Google Ads customer IDs.",
     )
     parser.add_argument(
         "-v",
@@ -148,4 +268,7 @@ if __name__ == "__main__":
     # home directory if none is specified.
     googleads_client = GoogleAdsClient.load_from_storage(version=args.api_version)
 
-    main(googleads_client, args.customer_id)
+    if len(args.customer_id) == 1:
+        main(googleads_client, args.customer_id[0])
+    else:
+        add_campaigns_for_customers(googleads_client, args.customer_id)
@@ -16,55 +16,247 @@
 """Optimized AI Max performance reporting."""
 
 import argparse
+import asyncio
 import csv
-from datetime import datetime, timedelta
-from typing import Any, List
+import io
+import itertools
+import os
+import re
+from datetime import date, timedelta
+from typing import Any, AsyncIterable, Callable, Iterable, List, Sequence
 
 from google.ads.googleads.client import GoogleAdsClient
 from google.ads.googleads.errors import GoogleAdsException
 
-def _write_to_csv(file_path: str, headers: List[str], rows: List[List[Any]]) -> None:
-    with open(file_path, "w", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        writer.writerow(headers)
-        writer.writerows(rows)
-    print(f"Report written to {file_path}")
+_CSV_BUFFER_SIZE = 1 << 20
+# Each queued item is one stream batch (up to 10,000 rows).
+_ASYNC_QUEUE_SIZE = 8
 
-def get_campaign_details(client: GoogleAdsClient, customer_id: str) -> None:
-    ga_service = client.get_service("GoogleAdsService")
-    query = """
+_CAMPAIGN_DETAILS_QUERY = """
         SELECT campaign.id, campaign.name, expanded_landing_page_view.expanded_final_url,
                campaign.ai_max_setting.enable_ai_max
         FROM expanded_landing_page_view
         WHERE campaign.ai_max_setting.enable_ai_max = TRUE
         ORDER BY campaign.id"""
-    stream = ga_service.search_stream(customer_id=customer_id, query=query)
-    rows = [[r.campaign.id, r.campaign.name, r.expanded_landing_page_view.expanded_final_url, r.campaign.ai_max_setting.enable_ai_max]
-            for b in stream for r in b.results]
-    _write_to_csv("saved_csv/ai_max_details.csv", ["ID", "Name", "URL", "Enabled"], rows)
-
-def get_search_terms(client: GoogleAdsClient, customer_id: str) -> None:
-    ga_service = client.get_service("GoogleAdsService")
-    end = datetime.now().strftime("%Y-%m-%d")
-    start = (datetime.now() - timedelta(days=30)).strftime("%Y-%m-%d")
-    query = f"""
+
+# Only the date window varies between runs.
+_SEARCH_TERMS_QUERY_TEMPLATE = """
         SELECT campaign.id, campaign.name, ai_max_search_term_ad_combination_view.search_term,
                metrics.impressions, metrics.clicks, metrics.conversions
         FROM ai_max_search_term_ad_combination_view
         WHERE segments.date BETWEEN '{start}' AND '{end}'
         ORDER BY metrics.impressions DESC"""
-    stream = ga_service.search_stream(customer_id=customer_id, query=query)
-    rows = [[r.campaign.id, r.campaign.name, r.ai_max_search_term_ad_combination_view.search_term,
-             r.metrics.impressions, r.metrics.clicks, r.metrics.conversions]
-            for b in stream for r in b.results]
-    _write_to_csv("saved_csv/ai_max_search_terms.csv", ["ID", "Name", "Term", "Impr", "Clicks", "Conv"], rows)
+_SEARCH_TERMS_DAYS = 30
+
+# Buffered bytes are handed to os.write once they reach this size.
+_RAW_FLUSH_SIZE = 1 << 16
+# Characters that force a field to be quoted, besides the delimiter.
+_RAW_NEEDS_QUOTING = re.compile(r'["\r\n]')
+# Characters that force a field to be quoted, including the delimiter.
+_ARROW_NEEDS_QUOTING = re.compile(r'[,"\r\n]')
+
+
+def _write_to_csv_arrow(
+    file_path: str,
+    headers: List[str],
+    stream: Iterable[Any],
+    extract_row: Callable[[Any], Sequence[Any]],
+) -> None:
+    # pyarrow is optional; it is only needed when this backend is selected.
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+
+    # Every column is text formatted as csv.writer formats it, so types cannot
+    # drift between batches. Arrow quotes every string it is allowed to quote,
+    # so it writes unquoted and the batches that need quoting go through
+    # csv.writer instead; either way the file matches the csv backend.
+    schema = pa.schema([(h, pa.string()) for h in headers])
+    options = pa_csv.WriteOptions(include_header=False, quoting_style="none", eol="\r\n")
+    quoted = io.StringIO()
+    quoted_writer = csv.writer(quoted)
+    with open(file_path, "wb") as f:
+        quoted_writer.writerow(headers)
+        f.write(quoted.getvalue().encode("utf-8"))
+        writer = pa_csv.CSVWriter(f, schema, write_options=options)
+        try:
+            for b in stream:
+                rows = [
+                    ["" if v is None else str(v) for v in extract_row(r)] for r in b.results
+                ]
+                if not rows:
+                    continue
+                if any(_ARROW_NEEDS_QUOTING.search(v) for row in rows for v in row):
+                    quoted.seek(0)
+                    quoted.truncate()
+                    quoted_writer.writerows(rows)
+                    f.write(quoted.getvalue().encode("utf-8"))
+                    continue
+                writer.write_batch(pa.RecordBatch.from_arrays(
+                    [pa.array(column, type=pa.string()) for column in zip(*rows)], schema=schema
+                ))
+        finally:
+            writer.close()
+
+def _write_to_csv_raw(
+    file_path: str,
+    headers: List[str],
+    stream: Iterable[Any],
+    extract_row: Callable[[Any], Sequence[Any]],
+) -> None:
+    # Plain rows are joined and encoded straight into a bytearray that is
+    # written with os.write, bypassing the text IO layer. Rows with a field
+    # that needs quoting are formatted by csv.writer so the output matches.
+    quoted = io.StringIO()
+    quoted_writer = csv.writer(quoted)
+    buf = bytearray()
+    fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        rows = (extract_row(r) for b in stream for r in b.results)
+        for row in itertools.chain((headers,), rows):
+            line = ",".join(["" if v is None else str(v) for v in row])
+            if line.count(",") == len(row) - 1 and not _RAW_NEEDS_QUOTING.search(line):
+                buf += line.encode("utf-8")
+                buf += b"\r\n"
+            else:
+                quoted_writer.writerow(row)
+                buf += quoted.getvalue().encode("utf-8")
+                quoted.seek(0)
+                quoted.truncate()
+            if len(buf) >= _RAW_FLUSH_SIZE:
+                _write_all(fd, buf)
+                buf.clear()
+        _write_all(fd, buf)
+    finally:
+        os.close(fd)
+
+def _write_all(fd: int, buf: bytearray) -> None:
+    view = memoryview(buf)
+    while view:
+        view = view[os.write(fd, view):]
+
+def _write_to_csv(
+    file_path: str,
+    headers: List[str],
+    stream: Iterable[Any],
+    extract_row: Callable[[Any], Sequence[Any]],
+    backend: str = "csv",
+) -> None:
+    if backend in ("pyarrow", "raw"):
+        writer = _write_to_csv_arrow if backend == "pyarrow" else _write_to_csv_raw
+        writer(file_path, headers, stream, extract_row)
+        print(f"Report written to {file_path}")
+        return
+    # Rows are pulled straight out of each stream batch by extract_row, so no
+    # intermediate list is built and writerows drains them in its C loop.
+    with open(file_path, "w", newline="", encoding="utf-8", buffering=_CSV_BUFFER_SIZE) as f:
+        writer = csv.writer(f)
+        writer.writerow(headers)
+        writer.writerows(extract_row(r) for b in stream for r in b.results)
+    print(f"Report written to {file_path}")
+
+async def _write_to_csv_async(
+    file_path: str,
+    headers: List[str],
+    stream: AsyncIterable[Any],
+    extract_row: Callable[[Any], Sequence[Any]],
+) -> None:
+    # The producer decodes batches off the network while the consumer writes
+    # the previous batch in a worker thread, so neither waits on the other.
+    queue: asyncio.Queue = asyncio.Queue(maxsize=_ASYNC_QUEUE_SIZE)
+
+    async def produce() -> None:
+        try:
+            async for b in stream:
+                await queue.put([extract_row(r) for r in b.results])
+        finally:
+            await queue.put(None)
+
+    with open(file_path, "w", newline="", encoding="utf-8", buffering=_CSV_BUFFER_SIZE) as f:
+        writer = csv.writer(f)
+        writer.writerow(headers)
+        producer = asyncio.create_task(produce())
+        while (rows := await queue.get()) is not None:
+            await asyncio.to_thread(writer.writerows, rows)
+        await producer
+    print(f"Report written to {file_path}")
+
+async def _run_report_async(
+    ga_service: Any,
+    customer_id: str,
+    query: str,
+    file_path: str,
+    headers: List[str],
+    extract_row: Callable[[Any], Sequence[Any]],
+) -> None:
+    stream = await ga_service.search_stream(customer_id=customer_id, query=query)
+    await _write_to_csv_async(file_path, headers, stream, extract_row)
+
+def _campaign_details_row(r: Any) -> Sequence[Any]:
+    return (r.campaign.id, r.campaign.name, r.expanded_landing_page_view.expanded_final_url,
+            r.campaign.ai_max_setting.enable_ai_max)
+
+def _search_terms_row(r: Any) -> Sequence[Any]:
+    return (r.campaign.id, r.campaign.name, r.ai_max_search_term_ad_combination_view.search_term,
+            r.metrics.impressions, r.metrics.clicks, r.metrics.conversions)
+
+_CAMPAIGN_DETAILS_REPORT = (
+    "saved_csv/ai_max_details.csv", ["ID", "Name", "URL", "Enabled"], _campaign_details_row
+)
+_SEARCH_TERMS_REPORT = (
+    "saved_csv/ai_max_search_terms.csv",
+    ["ID", "Name", "Term", "Impr", "Clicks", "Conv"],
+    _search_terms_row,
+)
+
+def _search_terms_query() -> str:
+    end = date.today()
+    start = end - timedelta(days=_SEARCH_TERMS_DAYS)
+    return _SEARCH_TERMS_QUERY_TEMPLATE.format(start=start.isoformat(), end=end.isoformat())
+
+def get_campaign_details(ga_service: Any, customer_id: str, backend: str = "csv") -> None:
+    file_path, headers, extract_row = _CAMPAIGN_DETAILS_REPORT
+    stream = ga_service.search_stream(customer_id=customer_id, query=_CAMPAIGN_DETAILS_QUERY)
+    _write_to_csv(file_path, headers, stream, extract_row, backend)
 
-def main(client: GoogleAdsClient, customer_id: str, report_type: str) -> None:
+def get_search_terms(ga_service: Any, customer_id: str, backend: str = "csv") -> None:
+    file_path, headers, extract_row = _SEARCH_TERMS_REPORT
+    stream = ga_service.search_stream(customer_id=customer_id, query=_search_terms_query())
+    _write_to_csv(file_path, headers, stream, extract_row, backend)
+
+async def get_campaign_details_async(ga_service: Any, customer_id: str) -> None:
+    await _run_report_async(
+        ga_service, customer_id, _CAMPAIGN_DETAILS_QUERY, *_CAMPAIGN_DETAILS_REPORT
+    )
+
+async def get_search_terms_async(ga_service: Any, customer_id: str) -> None:
+    await _run_report_async(ga_service, customer_id, _search_terms_query(), *_SEARCH_TERMS_REPORT)
+
+async def _main_async(client: GoogleAdsClient, customer_id: str, report_type: str) -> None:
+    # A grpc.aio channel is bound to the event loop it is created on, so the
+    # async service must be looked up inside the loop that uses it.
+    ga_service = client.get_service("GoogleAdsService", is_async=True)
+    if report_type == "campaign_details":
+        await get_campaign_details_async(ga_service, customer_id)
+    elif report_type == "search_terms":
+        await get_search_terms_async(ga_service, customer_id)
+
+def main(
+    client: GoogleAdsClient,
+    customer_id: str,
+    report_type: str,
+    use_async: bool = False,
+    backend: str = "csv",
+) -> None:
     try:
+        if use_async:
+            asyncio.run(_main_async(client, customer_id, report_type))
+            return
+        # One service client is shared by every report run from here.
+        ga_service = client.get_service("GoogleAdsService")
         if report_type == "campaign_details":
-            get_campaign_details(client, customer_id)
+            get_campaign_details(ga_service, customer_id, backend=backend)
         elif report_type == "search_terms":
-            get_search_terms(client, customer_id)
+            get_search_terms(ga_service, customer_id, backend=backend)
     except GoogleAdsException as ex:
         print(f"Request ID {ex.request_id} failed: {ex.error.code().name}")
 
@@ -81,6 +273,19 @@ if __name__ == "__main__":
     parser.add_argument(
         "-v", "--api_version", type=str, required=True, help="The Google Ads API version."
     )
+    parser.add_argument(
+        "--use_async",
+        action="store_true",
+        help="Overlap receiving stream batches with writing the CSV file.",
+    )
+    parser.add_argument(
+        "--csv_backend",
+        choices=["csv", "pyarrow", "raw"],
+        default="csv",
+        help="The CSV writer to use. raw writes encoded bytes to the file "
+        "descriptor directly; pyarrow must be installed separately. Neither "
+        "is used with --use_async.",
+    )
     args = parser.parse_args()
     client = GoogleAdsClient.load_from_storage(version=args.api_version)
-    main(client, args.customer_id, args.report_type)
+    main(client, args.customer_id, args.report_type, args.use_async, args.csv_backend)
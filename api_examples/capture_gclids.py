@@ -13,60 +13,118 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-"""This example captures a GCLID for an ad click."""
+"""This example captures GCLIDs for ad clicks and uploads them as conversions."""
 
 import argparse
+import io
 import sys
+from typing import Dict, Iterable, List, Optional, Union
 
 from google.ads.googleads.client import GoogleAdsClient
 from google.ads.googleads.errors import GoogleAdsException
 
+# The maximum number of conversions accepted in a single upload request.
+_MAX_CONVERSIONS_PER_REQUEST = 2000
+
+_CONVERSION_ACTION_QUERY = """
+    SELECT conversion_action.resource_name
+    FROM conversion_action
+    LIMIT 1"""
+
+# Conversion action resource names already looked up, keyed by customer ID.
+_conversion_action_cache: Dict[str, str] = {}
+
+
+def _get_conversion_action(client: GoogleAdsClient, customer_id: str) -> str:
+    """Returns the resource name of the first conversion action for a customer.
+
+    The lookup is performed once per customer ID and cached for later calls.
+
+    Args:
+        client: An initialized GoogleAdsClient instance.
+        customer_id: The client customer ID.
+
+    Returns:
+        The resource name of a conversion action.
+    """
+    if customer_id not in _conversion_action_cache:
+        ga_service = client.get_service("GoogleAdsService")
+        # Only one conversion action is needed, so LIMIT 1 keeps the server
+        # from scanning and returning the account's full list.
+        response = ga_service.search(
+            customer_id=customer_id, query=_CONVERSION_ACTION_QUERY
+        )
+        try:
+            _conversion_action_cache[customer_id] = next(
+                iter(response)
+            ).conversion_action.resource_name
+        except StopIteration:
+            print("No conversion actions found. Please create one.")
+            sys.exit(1)
+    return _conversion_action_cache[customer_id]
+
 
 def main(
-    client: GoogleAdsClient, customer_id: str, gclid: str, conversion_date_time: str
+    client: GoogleAdsClient,
+    customer_id: str,
+    gclids: Union[str, Iterable[str]],
+    conversion_date_time: str,
+    conversion_action_id: Optional[str] = None,
 ) -> None:
-    """Uploads a click conversion for a given GCLID.
+    """Uploads click conversions for the given GCLIDs.
+
+    Conversions are sent in requests of up to 2000 conversions each.
 
     Args:
         client: An initialized GoogleAdsClient instance.
         customer_id: The client customer ID.
-        gclid: The GCLID for the ad click.
-        conversion_date_time: The date and time of the conversion.
+        gclids: The GCLIDs for the ad clicks. A single GCLID string is
+            uploaded as one conversion.
+        conversion_date_time: The date and time of the conversions.
+        conversion_action_id: An optional conversion action ID. If omitted, the
+            first conversion action found for the customer is used.
     """
     conversion_upload_service = client.get_service("ConversionUploadService")
-    click_conversion = client.get_type("ClickConversion")
-    click_conversion.gclid = gclid
-    # Creates a ConversionActionService client.
-    conversion_action_service = client.get_service("ConversionActionService")
-    # Retrieves all conversion actions.
-    response = conversion_action_service.search_conversion_actions(
-        customer_id=customer_id
-    )
-    try:
-        conversion_action = next(iter(response)).resource_name
-    except StopIteration:
-        print("No conversion actions found. Please create one.")
-        sys.exit(1)
+    if conversion_action_id:
+        # Builds the resource name locally instead of searching for it.
+        conversion_action = client.get_service(
+            "ConversionActionService"
+        ).conversion_action_path(customer_id, conversion_action_id)
+    else:
+        conversion_action = _get_conversion_action(client, customer_id)
 
-    click_conversion.conversion_action = conversion_action
-    click_conversion.conversion_date_time = conversion_date_time
-    click_conversion.conversion_value = 23.41
-    click_conversion.currency_code = "USD"
-
-    # Creates a request message.
-    request = client.get_type("UploadClickConversionsRequest")
-    request.customer_id = customer_id
-    request.conversions.append(click_conversion)
-    request.partial_failure = True
-    conversion_upload_response = conversion_upload_service.upload_click_conversions(
-        request=request,
-    )
-    print(conversion_upload_response)
+    # Builds each conversion through the message constructor, which sets all
+    # fields in one pass instead of one attribute assignment per field.
+    click_conversion_class = type(client.get_type("ClickConversion"))
+    # A bare string is one GCLID, not an iterable of one-character GCLIDs.
+    gclids = [gclids] if isinstance(gclids, str) else list(gclids)
+    for offset in range(0, len(gclids), _MAX_CONVERSIONS_PER_REQUEST):
+        click_conversions: List = [
+            click_conversion_class(
+                gclid=gclid,
+                conversion_action=conversion_action,
+                conversion_date_time=conversion_date_time,
+                conversion_value=23.41,
+                currency_code="USD",
+            )
+            for gclid in gclids[offset : offset + _MAX_CONVERSIONS_PER_REQUEST]
+        ]
+
+        # Creates a request message.
+        request = client.get_type("UploadClickConversionsRequest")
+        request.customer_id = customer_id
+        request.conversions.extend(click_conversions)
+        # Partial failure keeps one invalid GCLID from failing the whole batch.
+        request.partial_failure = True
+        conversion_upload_response = conversion_upload_service.upload_click_conversions(
+            request=request,
+        )
+        print(conversion_upload_response)
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
-        description="Uploads a click conversion for a given GCLID."
+        description="Uploads click conversions for the given GCLIDs."
     )
     # The following argument(s) are required to run the example.
     parser.add_argument(
@@ -78,10 +136,20 @@ if __name__ == "__main__":
     )
     parser.add_argument(
         "-g",
+        "--gclids",
         "--gclid",
+        dest="gclids",
         type=str,
+        nargs="+",
         required=True,
-        help="The GCLID for the ad click.",
+        help="One or more GCLIDs for the ad clicks.",
+    )
+    parser.add_argument(
+        "-a",
+        "--conversion_action_id",
+        type=str,
+        help="The conversion action ID. If omitted, the first conversion "
+        "action found for the customer is used.",
     )
     parser.add_argument(
         "-v", "--api_version", type=str, required=True, help="The Google Ads API version."
@@ -96,17 +164,24 @@ if __name__ == "__main__":
         main(
             googleads_client,
             args.customer_id,
-            args.gclid,
+            args.gclids,
             args.conversion_date_time,
+            args.conversion_action_id,
         )
     except GoogleAdsException as ex:
-        print(
+        # A partially failed bulk upload can report thousands of errors, so
+        # the report is built in memory and written with a single call.
+        buffer = io.StringIO()
+        buffer.write(
             f'Request with ID "{ex.request_id}" failed with status '
-            f'"{ex.error.code().name}" and includes the following errors:'
+            f'"{ex.error.code().name}" and includes the following errors:\n'
         )
         for error in ex.failure.errors:
-            print(f'\tError with message "{error.message}".')
+            buffer.write(f'\tError with message "{error.message}".\n')
             if error.location:
-                for field_path_element in error.location.field_path_elements:
-                    print(f"\t\tOn field: {field_path_element.field_name}")
+                buffer.writelines(
+                    f"\t\tOn field: {field_path_element.field_name}\n"
+                    for field_path_element in error.location.field_path_elements
+                )
+        sys.stdout.write(buffer.getvalue())
         sys.exit(1)
@@ -15,84 +15,219 @@
 """Optimized example to retrieve conversion reports."""
 
 import argparse
+import contextlib
 import csv
+import functools
+import itertools
+import math
+import os
+import re
 import sys
-from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Tuple
+from datetime import date, timedelta
+from operator import attrgetter
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple
 
 from google.ads.googleads.client import GoogleAdsClient
 from google.ads.googleads.errors import GoogleAdsException
 
 
+@functools.lru_cache(maxsize=None)
+def _get_service(client: GoogleAdsClient, name: str) -> Any:
+    """Returns the named service client, created once per client instance."""
+    return client.get_service(name)
+
+
 def handle_googleads_exception(exception: GoogleAdsException) -> None:
     """Prints the details of a GoogleAdsException."""
-    print(
+    # A bulk failure can carry thousands of errors, so the lines are joined
+    # and written to stderr in one call.
+    parts = [
         f'Request with ID "{exception.request_id}" failed with status '
         f'"{exception.error.code().name}" and includes the following errors:'
-    )
+    ]
     for error in exception.failure.errors:
-        print(f'\tError with message "{error.message}".')
+        parts.append(f'\tError with message "{error.message}".')
         if error.location:
-            for field_path_element in error.location.field_path_elements:
-                print(f"\t\tOn field: {field_path_element.field_name}")
+            parts.extend(
+                f"\t\tOn field: {field_path_element.field_name}"
+                for field_path_element in error.location.field_path_elements
+            )
+    sys.stderr.write("\n".join(parts) + "\n")
     sys.exit(1)
 
 
+# Presets that cover a fixed number of days back from today. Any other
+# LAST_<N>_DAYS preset is parsed from its name.
+_PRESET_DAYS = {
+    "LAST_7_DAYS": 7,
+    "LAST_14_DAYS": 14,
+    "LAST_30_DAYS": 30,
+    "LAST_6_MONTHS": 180,
+    "LAST_YEAR": 365,
+}
+_LAST_N_DAYS_RE = re.compile(r"^LAST_(\d+)_DAYS$")
+
+
 def _calculate_date_range(
     start_date_str: Optional[str],
     end_date_str: Optional[str],
     date_range_preset: Optional[str],
 ) -> Tuple[str, str]:
     """Calculates start and end dates with support for presets and custom ranges."""
-    today = datetime.now()
+    today = date.today()
     if date_range_preset:
-        if date_range_preset.startswith("LAST_") and date_range_preset.endswith("_DAYS"):
-            try:
-                days = int(date_range_preset.split("_")[1])
-                start_date = today - timedelta(days=days)
-                return start_date.strftime("%Y-%m-%d"), today.strftime("%Y-%m-%d")
-            except ValueError:
-                pass
-
-        presets = {
-            "LAST_MONTH": (
-                (today.replace(day=1) - timedelta(days=1)).replace(day=1),
-                today.replace(day=1) - timedelta(days=1),
-            ),
-            "LAST_YEAR": (today - timedelta(days=365), today),
-        }
-        if date_range_preset in presets:
-            start, end = presets[date_range_preset]
-            return start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d")
+        days = _PRESET_DAYS.get(date_range_preset)
+        if days is None and (match := _LAST_N_DAYS_RE.match(date_range_preset)):
+            days = int(match.group(1))
+        if days is not None:
+            return (today - timedelta(days=days)).isoformat(), today.isoformat()
+        if date_range_preset == "LAST_MONTH":
+            end = today.replace(day=1) - timedelta(days=1)
+            return end.replace(day=1).isoformat(), end.isoformat()
 
     if start_date_str and end_date_str:
-        return start_date_str, end_date_str
+        try:
+            start = date.fromisoformat(start_date_str)
+            end = date.fromisoformat(end_date_str)
+        except ValueError:
+            pass
+        else:
+            return start.isoformat(), end.isoformat()
 
     print("Error: Invalid or missing date range. Defaulting to LAST_30_DAYS.")
-    return (today - timedelta(days=30)).strftime("%Y-%m-%d"), today.strftime("%Y-%m-%d")
+    return (today - timedelta(days=30)).isoformat(), today.isoformat()
+
+
+_CSV_BUFFER_SIZE = 1 << 22
+_DEFAULT_CONSOLE_LIMIT = 1000
+
+# Parses a "field=value" filter argument.
+_FILTER_RE = re.compile(r"^\s*([\w.]+)\s*=\s*(.*?)\s*$")
 
+# WHERE clause templates for filter keys that are not a plain field equality
+# check; {value} becomes the placeholder for the filter's formatted value.
+_FILTER_CLAUSES = {"min_conversions": "metrics.conversions > {value}"}
+_DEFAULT_FILTER_CLAUSE = "{key} = '{value}'"
+
+# GAQL field for each metric name accepted by --metrics.
+_METRIC_TO_FIELD = {
+    "conversions": "metrics.conversions",
+    "all_conversions": "metrics.all_conversions",
+    "conversions_value": "metrics.conversions_value",
+    "clicks": "metrics.clicks",
+    "impressions": "metrics.impressions",
+}
+
+# Column header for each field a performance report can select, in the order
+# the columns are emitted.
+_PERFORMANCE_COLUMNS = {
+    "segments.date": "Date",
+    "segments.conversion_action_name": "Action",
+    "campaign.id": "Campaign ID",
+    "campaign.name": "Campaign",
+    "metrics.conversions": "Conversions",
+    "metrics.all_conversions": "All Conv",
+    "metrics.conversions_value": "Value",
+}
+
+# String fields whose values repeat across many rows (one row per campaign or
+# action per day).
+_REPEATED_FIELDS = frozenset(
+    {"segments.date", "campaign.name", "segments.conversion_action_name"}
+)
+
+_ACTIONS_HEADERS = [
+    "ID",
+    "Name",
+    "Status",
+    "Type",
+    "Category",
+    "Owner",
+    "Include In Conversions",
+    "Click-Through Window Days",
+    "View-Through Window Days",
+    "Attribution",
+    "Data-Driven Model Status",
+]
+
+
+@contextlib.contextmanager
+def _open_csv_atomically(output_file: str) -> Iterator[TextIO]:
+    """Opens a sibling ".part" file and moves it over output_file on success.
+
+    An interrupted report leaves the previous output_file untouched rather
+    than a truncated CSV in its place.
+    """
+    directory = os.path.dirname(output_file)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_file = output_file + ".part"
+    try:
+        # A large buffer coalesces the writer's many small per-row writes;
+        # nothing is flushed until the file is closed.
+        with open(
+            tmp_file, "w", newline="", encoding="utf-8", buffering=_CSV_BUFFER_SIZE
+        ) as f:
+            yield f
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_file)
+        raise
+    os.replace(tmp_file, output_file)
 
-def _process_and_output_results(
-    results_data: List[Dict[str, Any]], output_format: str, output_file: str
+
+def _interning(
+    extract_row: Callable[[Any], Sequence[Any]], indices: List[int]
+) -> Callable[[Any], Sequence[Any]]:
+    """Wraps a row extractor so the values at the given indices are interned."""
+
+    def extract(row: Any) -> Sequence[Any]:
+        values = list(extract_row(row))
+        for i in indices:
+            values[i] = sys.intern(values[i])
+        return values
+
+    return extract
+
+
+def _output_results(
+    headers: List[str],
+    rows: Iterable[Sequence[Any]],
+    output_format: str,
+    output_file: str,
 ) -> None:
-    """Outputs results to console or CSV with dynamic column sizing."""
-    if not results_data:
+    """Outputs rows to console or streams them to CSV as they are produced."""
+    rows = iter(rows)
+    first_row = next(rows, None)
+    if first_row is None:
         print("No data found.")
         return
 
     if output_format == "console":
-        headers = list(results_data[0].keys())
-        widths = {h: max(len(h), max(len(str(r[h])) for r in results_data)) for h in headers}
-        header_line = " | ".join(h.ljust(widths[h]) for h in headers)
-        print(header_line)
-        print("-" * len(header_line))
-        for row in results_data:
-            print(" | ".join(str(row[h]).ljust(widths[h]) for h in headers))
+        # Column widths depend on every row, so console output is buffered.
+        # Each cell is stringified exactly once while the widths are tracked.
+        widths = [len(h) for h in headers]
+        cells = []
+        for row in itertools.chain((first_row,), rows):
+            row_cells = [str(v) for v in row]
+            for i, cell in enumerate(row_cells):
+                if len(cell) > widths[i]:
+                    widths[i] = len(cell)
+            cells.append(row_cells)
+        header_line = " | ".join(h.ljust(widths[i]) for i, h in enumerate(headers))
+        lines = [header_line, "-" * len(header_line)]
+        lines.extend(
+            " | ".join(c.ljust(widths[i]) for i, c in enumerate(row_cells))
+            for row_cells in cells
+        )
+        # Header, separator and body go out in a single write.
+        sys.stdout.write("\n".join(lines) + "\n")
     elif output_format == "csv":
-        with open(output_file, "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=results_data[0].keys())
-            writer.writeheader()
-            writer.writerows(results_data)
+        with _open_csv_atomically(output_file) as f:
+            writer = csv.writer(f)
+            writer.writerow(headers)
+            writer.writerow(first_row)
+            writer.writerows(rows)
         print(f"Results written to {output_file}")
 
 
@@ -100,7 +235,7 @@ def get_conversion_actions_report(
     client: GoogleAdsClient, customer_id: str, output_file: str
 ) -> None:
     """Retrieves conversion action metadata."""
-    ga_service = client.get_service("GoogleAdsService")
+    ga_service = _get_service(client, "GoogleAdsService")
     query = """
     SELECT
       conversion_action.id,
@@ -110,25 +245,111 @@ def get_conversion_actions_report(
       conversion_action.category,
       conversion_action.owner_customer,
       conversion_action.include_in_conversions_metric,
-      conversion_action.attribution_model_settings.attribution_model
+      conversion_action.click_through_lookback_window_days,
+      conversion_action.view_through_lookback_window_days,
+      conversion_action.attribution_model_settings.attribution_model,
+      conversion_action.attribution_model_settings.data_driven_model_status
     FROM conversion_action
     WHERE conversion_action.status != 'REMOVED'
     """
 
     stream = ga_service.search_stream(customer_id=customer_id, query=query)
-    results = []
-    for batch in stream:
-        for row in batch.results:
-            ca = row.conversion_action
-            results.append({
-                "ID": ca.id,
-                "Name": ca.name,
-                "Status": ca.status.name,
-                "Type": ca.type.name,
-                "Category": ca.category.name,
-                "Attribution": ca.attribution_model_settings.attribution_model.name,
-            })
-    _process_and_output_results(results, "csv", output_file)
+    # Rows go straight from the stream to the writer as positional tuples in
+    # header order.
+    with _open_csv_atomically(output_file) as f:
+        writer = csv.writer(f)
+        writer.writerow(_ACTIONS_HEADERS)
+        for batch in stream:
+            for row in batch.results:
+                ca = row.conversion_action
+                attribution = ca.attribution_model_settings
+                writer.writerow(
+                    (
+                        ca.id,
+                        ca.name,
+                        ca.status.name,
+                        ca.type.name,
+                        ca.category.name,
+                        ca.owner_customer,
+                        ca.include_in_conversions_metric,
+                        ca.click_through_lookback_window_days,
+                        ca.view_through_lookback_window_days,
+                        attribution.attribution_model.name,
+                        attribution.data_driven_model_status.name,
+                    )
+                )
+    print(f"Results written to {output_file}")
+
+
+def _escape_gaql_string(value: str) -> str:
+    """Escapes a value for use inside a single-quoted GAQL string literal."""
+    return value.replace("\\", "\\\\").replace("'", "\\'")
+
+
+def _format_number(value: str) -> str:
+    """Formats a numeric filter value, raising ValueError if it is not a finite number."""
+    number = float(value)
+    if not math.isfinite(number):
+        raise ValueError(f"not a finite number: {value!r}")
+    return str(number)
+
+
+# Value formatters for filter keys whose value is not a GAQL string literal.
+_FILTER_VALUE_FORMATTERS = {"min_conversions": _format_number}
+
+
+def _filter_argument(arg: str) -> str:
+    """Validates a --filters value for argparse and returns it unchanged."""
+    match = _FILTER_RE.match(arg)
+    if match:
+        key, value = match.groups()
+        formatter = _FILTER_VALUE_FORMATTERS.get(key)
+        if formatter is not None:
+            try:
+                formatter(value)
+            except ValueError:
+                raise argparse.ArgumentTypeError(
+                    f"{key} must be a number, got {value!r}"
+                ) from None
+    return arg
+
+
+@functools.lru_cache(maxsize=64)
+def _build_gaql(
+    metrics: Tuple[str, ...],
+    filter_keys: Tuple[str, ...],
+    limit: Optional[int],
+) -> Tuple[str, Tuple[str, ...]]:
+    """Builds the performance report query template and returns it with its fields.
+
+    The template only depends on the query's shape: the date window and filter
+    values are left as {start}, {end} and {filter_N} placeholders for
+    str.format_map, so runs that only vary those values reuse the cache entry.
+    """
+    select_fields = ["segments.date", "campaign.id", "campaign.name"]
+    from_resource = "campaign"
+
+    if "segments.conversion_action_name" in metrics or "segments.conversion_action_name" in filter_keys:
+        from_resource = "customer"
+        select_fields = ["segments.date", "segments.conversion_action_name"]
+
+    # Metric fields follow _METRIC_TO_FIELD order rather than the order they
+    # were requested in, so equivalent requests emit identical query text.
+    metric_fields = [f for m, f in _METRIC_TO_FIELD.items() if m in metrics]
+    # dict.fromkeys de-duplicates while keeping the field order stable.
+    query_fields = list(dict.fromkeys(select_fields + metric_fields))
+
+    query = f"SELECT {', '.join(query_fields)} FROM {from_resource} "
+    query += "WHERE segments.date BETWEEN '{start}' AND '{end}' "
+
+    for i, key in enumerate(filter_keys):
+        clause = _FILTER_CLAUSES.get(key, _DEFAULT_FILTER_CLAUSE)
+        query += "AND " + clause.format(key=key, value=f"{{filter_{i}}}") + " "
+
+    query += "ORDER BY segments.date DESC "
+    if limit:
+        query += f"LIMIT {limit}"
+    return query, tuple(query_fields)
 
 
 def get_conversion_performance_report(
@@ -144,61 +365,49 @@ def get_conversion_performance_report(
     limit: Optional[int],
 ) -> None:
     """Retrieves conversion performance metrics with mapping-based extraction."""
-    ga_service = client.get_service("GoogleAdsService")
+    ga_service = _get_service(client, "GoogleAdsService")
     start, end = _calculate_date_range(start_date, end_date, date_range_preset)
 
-    resource_map = {
-        "conversions": "metrics.conversions",
-        "all_conversions": "metrics.all_conversions",
-        "conversions_value": "metrics.conversions_value",
-        "clicks": "metrics.clicks",
-        "impressions": "metrics.impressions",
-    }
-
-    select_fields = ["segments.date", "campaign.id", "campaign.name"]
-    from_resource = "campaign"
-
-    if "segments.conversion_action_name" in metrics or any("conversion_action_name" in f for f in filters):
-        from_resource = "customer"
-        select_fields = ["segments.date", "segments.conversion_action_name"]
-
-    metric_fields = [resource_map[m] for m in metrics if m in resource_map]
-    query_fields = list(set(select_fields + metric_fields))
-
-    query = f"SELECT {', '.join(query_fields)} FROM {from_resource} "
-    query += f"WHERE segments.date BETWEEN '{start}' AND '{end}' "
+    if output_format == "console" and not limit:
+        # Rows past the limit are never transferred, rather than fetched and
+        # scrolled past.
+        limit = _DEFAULT_CONSOLE_LIMIT
+        print(
+            f"Console output is limited to {limit} rows. Pass --limit or "
+            "--output_format csv to retrieve more."
+        )
 
-    for f in filters:
-        if "=" in f:
-            key, val = f.split("=")
-            query += f"AND {key.strip()} = '{val.strip()}' "
+    # Filters are parsed once; everything downstream works off this dict.
+    parsed_filters = dict(m.groups() for m in map(_FILTER_RE.match, filters) if m)
+    template, query_fields = _build_gaql(
+        tuple(sorted(set(metrics))), tuple(parsed_filters), limit
+    )
+    values = {"start": start, "end": end}
+    for i, (key, value) in enumerate(parsed_filters.items()):
+        values[f"filter_{i}"] = _FILTER_VALUE_FORMATTERS.get(key, _escape_gaql_string)(value)
+    query = template.format_map(values)
 
-    query += "ORDER BY segments.date DESC "
-    if limit:
-        query += f"LIMIT {limit}"
+    # The selected columns are resolved once, outside the per-row loop, into
+    # a single attrgetter that walks every dotted path in C. This beats
+    # converting each row with json_format.MessageToDict, which walks every
+    # populated field in Python and renders int64 values as strings.
+    selected = frozenset(query_fields)
+    paths = [f for f in _PERFORMANCE_COLUMNS if f in selected]
+    headers = [_PERFORMANCE_COLUMNS[f] for f in paths]
+    extract_row = attrgetter(*paths)
+    if len(paths) == 1:
+        extract_row = lambda row, getter=extract_row: (getter(row),)
+    if output_format == "console":
+        # Console rows are buffered until all column widths are known, so
+        # repeated dates and names are interned to share one string each.
+        repeated = [i for i, f in enumerate(paths) if f in _REPEATED_FIELDS]
+        if repeated:
+            extract_row = _interning(extract_row, repeated)
 
     try:
         stream = ga_service.search_stream(customer_id=customer_id, query=query)
-        results_data = []
-        for batch in stream:
-            for row in batch.results:
-                data = {}
-                field_mapping = {
-                    "segments.date": ("Date", row.segments.date),
-                    "segments.conversion_action_name": ("Action", row.segments.conversion_action_name),
-                    "campaign.id": ("Campaign ID", row.campaign.id),
-                    "campaign.name": ("Campaign", row.campaign.name),
-                    "metrics.conversions": ("Conversions", row.metrics.conversions),
-                    "metrics.all_conversions": ("All Conv", row.metrics.all_conversions),
-                    "metrics.conversions_value": ("Value", row.metrics.conversions_value),
-                }
-                for f in query_fields:
-                    if f in field_mapping:
-                        name, val = field_mapping[f]
-                        data[name] = val
-                results_data.append(data)
-
-        _process_and_output_results(results_data, output_format, output_file)
+        rows = (extract_row(row) for batch in stream for row in batch.results)
+        _output_results(headers, rows, output_format, output_file)
     except GoogleAdsException as ex:
         handle_googleads_exception(ex)
 
@@ -211,7 +420,8 @@ if __name__ == "__main__":
     parser.add_argument("-f", "--output_file", default="saved_csv/conversion_report.csv")
     parser.add_argument("--date_range_preset", default="LAST_30_DAYS")
     parser.add_argument("--metrics", nargs="+", default=["conversions"])
-    parser.add_argument("--filters", nargs="*", default=[])
+    parser.add_argument("--filters", nargs="*", type=_filter_argument, default=[])
+    parser.add_argument("--limit", type=int, help="The maximum number of rows to return.")
     parser.add_argument("-v", "--api_version", type=str, required=True, help="The Google Ads API version.")
 
     args = parser.parse_args()
@@ -20,12 +20,44 @@ the experiment arms are created in this process.
 """
 
 import argparse
+import functools
 import sys
 import uuid
 
 from google.ads.googleads.client import GoogleAdsClient
 from google.ads.googleads.errors import GoogleAdsException
-from google.api_core import protobuf_helpers
+
+
+@functools.lru_cache(maxsize=None)
+def _get_service(client, name):
+    """Returns the named service client, created once per client instance.
+
+    Args:
+        client: an initialized GoogleAdsClient instance.
+        name: the name of the service, e.g. "CampaignService".
+    """
+    return client.get_service(name)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_type_class(client, name):
+    """Returns the class of the named message type, resolved once per client.
+
+    Args:
+        client: an initialized GoogleAdsClient instance.
+        name: the name of the message type, e.g. "CampaignOperation".
+    """
+    return type(client.get_type(name))
+
+
+def _get_type(client, name):
+    """Returns a new, empty instance of the named message type.
+
+    Args:
+        client: an initialized GoogleAdsClient instance.
+        name: the name of the message type, e.g. "CampaignOperation".
+    """
+    return _get_type_class(client, name)()
 
 
 def main(client, customer_id, base_campaign_id):
@@ -47,8 +79,10 @@ def main(client, customer_id, base_campaign_id):
     modify_treatment_campaign(client, customer_id, draft_campaign_resource_name)
 
     # When you're done setting up the experiment and arms and modifying the
-    # draft campaign, this will begin the experiment.
-    experiment_service = client.get_service("ExperimentService")
+    # draft campaign, this will begin the experiment. Scheduling must wait for
+    # the draft campaign update above to finish; scheduling first would start
+    # the experiment from the unmodified draft, so these calls stay sequential.
+    experiment_service = _get_service(client, "ExperimentService")
     print(f"Scheduling experiment with resource name {experiment}...")
     experiment_service.schedule_experiment(resource_name=experiment)
     print("Experiment scheduled successfully.")
@@ -64,7 +98,7 @@ def create_experiment_resource(client, customer_id):
     Returns:
         the resource name for the new experiment.
     """
-    experiment_operation = client.get_type("ExperimentOperation")
+    experiment_operation = _get_type(client, "ExperimentOperation")
     experiment = experiment_operation.create
 
     experiment.name = f"Campaign Version Test Experiment #{uuid.uuid4()}"
@@ -72,7 +106,7 @@ def create_experiment_resource(client, customer_id):
     experiment.suffix = "[experiment]"
     experiment.status = client.enums.ExperimentStatusEnum.SETUP
 
-    experiment_service = client.get_service("ExperimentService")
+    experiment_service = _get_service(client, "ExperimentService")
     response = experiment_service.mutate_experiments(
         customer_id=customer_id, operations=[experiment_operation]
     )
@@ -98,10 +132,10 @@ def create_experiment_arms(client, customer_id, base_campaign_id, experiment):
     """
     operations = []
 
-    campaign_service = client.get_service("CampaignService")
+    campaign_service = _get_service(client, "CampaignService")
 
     # The "control" arm references an already-existing campaign.
-    operation_1 = client.get_type("ExperimentArmOperation")
+    operation_1 = _get_type(client, "ExperimentArmOperation")
     exa_1 = operation_1.create
     exa_1.control = True
     exa_1.campaigns.append(
@@ -115,7 +149,7 @@ def create_experiment_arms(client, customer_id, base_campaign_id, experiment):
     # The non-"control" arm, also called a "treatment" arm, will automatically
     # generate a draft campaign that you can modify before starting the
     # experiment.
-    operation_2 = client.get_type("ExperimentArmOperation")
+    operation_2 = _get_type(client, "ExperimentArmOperation")
     exa_2 = operation_2.create
     exa_2.control = False
     exa_2.experiment = experiment
@@ -123,8 +157,8 @@ def create_experiment_arms(client, customer_id, base_campaign_id, experiment):
     exa_2.traffic_split = 50  # Example: 50% traffic to treatment
     operations.append(operation_2)
 
-    experiment_arm_service = client.get_service("ExperimentArmService")
-    request = client.get_type("MutateExperimentArmsRequest")
+    experiment_arm_service = _get_service(client, "ExperimentArmService")
+    request = _get_type(client, "MutateExperimentArmsRequest")
     request.customer_id = customer_id
     request.operations = operations
     request.response_content_type = (
@@ -160,8 +194,8 @@ def modify_treatment_campaign(client, customer_id, draft_campaign_resource_name)
         customer_id: a client customer ID.
         draft_campaign_resource_name: the resource name for an in-design campaign.
     """
-    campaign_service = client.get_service("CampaignService")
-    campaign_operation = client.get_type("CampaignOperation")
+    campaign_service = _get_service(client, "CampaignService")
+    campaign_operation = _get_type(client, "CampaignOperation")
     campaign = campaign_operation.update
     campaign.resource_name = draft_campaign_resource_name
 
@@ -176,11 +210,10 @@ def modify_treatment_campaign(client, customer_id, draft_campaign_resource_name)
     campaign.budget.amount_micros = 20_000_000  # Example: Set budget to 20 USD
 
     # You MUST specify which fields are being updated by setting the update_mask.
-    # The protobuf_helpers.field_mask utility can help with this.
-    client.copy_from(
-        campaign_operation.update_mask,
-        protobuf_helpers.field_mask(None, campaign._pb),
-    )
+    # Listing the paths you set directly avoids walking the whole campaign
+    # message the way protobuf_helpers.field_mask does; keep this list in sync
+    # with the fields changed above.
+    campaign_operation.update_mask.paths.extend(["name", "budget.amount_micros"])
 
     try:
         campaign_service.mutate_campaigns(
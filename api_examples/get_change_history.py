@@ -16,36 +16,47 @@
 """Retrieves change history with optional resource type filtering."""
 
 import argparse
+import sys
 from datetime import datetime, timedelta
 from google.ads.googleads.client import GoogleAdsClient
 from google.ads.googleads.errors import GoogleAdsException
 
-def main(client: GoogleAdsClient, customer_id: str, start: str, end: str, resource_type: str = None) -> None:
-    ga_service = client.get_service("GoogleAdsService")
-    where_clauses = [f"change_status.last_change_date_time BETWEEN '{start}' AND '{end}'"]
-    if resource_type:
-        where_clauses.append(f"change_status.resource_type = '{resource_type.upper()}'")
 
-    query = f"""
+_CHANGE_HEADER = f"{'Date/Time':<25} | {'Type':<20} | {'Status':<15} | {'Resource'}\n" + "-" * 100 + "\n"
+_CHANGE_ROW_TEMPLATE = "{0!s:<25} | {1:<20} | {2:<15} | {3}\n"
+
+_CHANGE_HISTORY_QUERY_TEMPLATE = """
         SELECT
             change_status.resource_name,
             change_status.last_change_date_time,
             change_status.resource_type,
             change_status.resource_status
         FROM change_status
-        WHERE {" AND ".join(where_clauses)}
+        WHERE {where}
         ORDER BY change_status.last_change_date_time DESC
         LIMIT 1000
     """
 
+def main(client: GoogleAdsClient, customer_id: str, start: str, end: str, resource_type: str = None) -> None:
+    ga_service = client.get_service("GoogleAdsService")
+    where_clauses = [f"change_status.last_change_date_time BETWEEN '{start}' AND '{end}'"]
+    if resource_type:
+        where_clauses.append(f"change_status.resource_type = '{resource_type.upper()}'")
+
+    query = _CHANGE_HISTORY_QUERY_TEMPLATE.format(where=" AND ".join(where_clauses))
+
     try:
-        stream = ga_service.search_stream(customer_id=customer_id, query=query)
-        print(f"{'Date/Time':<25} | {'Type':<20} | {'Status':<15} | {'Resource'}")
-        print("-" * 100)
-        for batch in stream:
-            for row in batch.results:
-                cs = row.change_status
-                print(f"{str(cs.last_change_date_time):<25} | {cs.resource_type.name:<20} | {cs.resource_status.name:<15} | {cs.resource_name}")
+        # LIMIT 1000 always fits in a single 10,000-row page, so one unary
+        # search call replaces the stream.
+        response = ga_service.search(customer_id=customer_id, query=query)
+        # The query's LIMIT keeps the whole table small enough to emit, header
+        # included, in a single write.
+        sys.stdout.write(_CHANGE_HEADER + "".join(
+            _CHANGE_ROW_TEMPLATE.format(
+                cs.last_change_date_time, cs.resource_type.name, cs.resource_status.name, cs.resource_name
+            )
+            for cs in (row.change_status for row in response)
+        ))
     except GoogleAdsException as ex:
         print(f"Error (Request ID {ex.request_id}): {ex.failure.errors[0].message}")
 
@@ -16,30 +16,47 @@
 """Summarizes offline conversion uploads with mandatory calculation logic."""
 
 import argparse
+import sys
+from typing import Any
+
 from google.ads.googleads.client import GoogleAdsClient
 from google.ads.googleads.errors import GoogleAdsException
 
+
+_CLIENT_SUMMARY_QUERY = """
+    SELECT offline_conversion_upload_client_summary.client,
+           offline_conversion_upload_client_summary.status,
+           offline_conversion_upload_client_summary.successful_event_count,
+           offline_conversion_upload_client_summary.total_event_count,
+           offline_conversion_upload_client_summary.daily_summaries
+    FROM offline_conversion_upload_client_summary"""
+
+
+def _format_daily_summaries(daily_summaries: Any) -> str:
+    """Formats the success ratio of each day's uploads, one line per day."""
+    lines = []
+    for ds in daily_summaries:
+        # Mandate: total = success + failed + pending
+        total = ds.successful_count + ds.failed_count + ds.pending_count
+        lines.append(f"  {ds.upload_date}: {ds.successful_count}/{total} successful\n")
+    return "".join(lines)
+
+
 def main(client: GoogleAdsClient, customer_id: str) -> None:
     ga_service = client.get_service("GoogleAdsService")
-    query = """
-        SELECT offline_conversion_upload_client_summary.client,
-               offline_conversion_upload_client_summary.status,
-               offline_conversion_upload_client_summary.successful_event_count,
-               offline_conversion_upload_client_summary.total_event_count,
-               offline_conversion_upload_client_summary.daily_summaries
-        FROM offline_conversion_upload_client_summary"""
 
     try:
-        stream = ga_service.search_stream(customer_id=customer_id, query=query)
+        stream = ga_service.search_stream(customer_id=customer_id, query=_CLIENT_SUMMARY_QUERY)
         for batch in stream:
             for row in batch.results:
                 s = row.offline_conversion_upload_client_summary
-                print(f"Client: {s.client.name}, Status: {s.status.name}")
-                print(f"Total: {s.total_event_count}, Success: {s.successful_event_count}")
-                for ds in s.daily_summaries:
-                    # Mandate: total = success + failed + pending
-                    total = ds.successful_count + ds.failed_count + ds.pending_count
-                    print(f"  {ds.upload_date}: {ds.successful_count}/{total} successful")
+                # Each summary is formatted as one block and written with a
+                # single call.
+                sys.stdout.write(
+                    f"Client: {s.client.name}, Status: {s.status.name}\n"
+                    f"Total: {s.total_event_count}, Success: {s.successful_event_count}\n"
+                    + _format_daily_summaries(s.daily_summaries)
+                )
     except GoogleAdsException as ex:
         print(f"Request ID {ex.request_id} failed: {ex.error.code().name}")
 
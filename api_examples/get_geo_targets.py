@@ -16,49 +16,161 @@
 """Retrieves geo targets using efficient bulk queries."""
 
 import argparse
+import contextlib
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from operator import attrgetter
+from typing import Any, Dict, Iterable, List, Optional, Set
+
 from google.ads.googleads.client import GoogleAdsClient
 from google.ads.googleads.errors import GoogleAdsException
 
-def main(client: GoogleAdsClient, customer_id: str) -> None:
-    ga_service = client.get_service("GoogleAdsService")
-    # Bulk query for criteria
-    query = """
+# Location IDs per geo_target_constant lookup, keeping each IN clause well
+# within GAQL's limits; the lookups run concurrently.
+_GEO_IDS_PER_QUERY = 500
+_MAX_WORKERS = 8
+
+
+_CRITERIA_QUERY = """
         SELECT campaign.id, campaign.name, campaign_criterion.criterion_id, campaign_criterion.negative
         FROM campaign_criterion
         WHERE campaign_criterion.type = 'LOCATION'"""
 
+# Geo target constants are occasionally renamed or retired, so cached names
+# older than this are fetched again.
+_GEO_CACHE_MAX_AGE_SECONDS = 30 * 24 * 60 * 60
+
+# Reads a criterion row's campaign name, location ID and negative flag in a
+# single C-level call.
+_criterion_fields = attrgetter(
+    "campaign.name", "campaign_criterion.criterion_id", "campaign_criterion.negative"
+)
+
+# Every chunk shares this query shape; only the ID list differs.
+_GEO_QUERY_TEMPLATE = (
+    "SELECT geo_target_constant.id, geo_target_constant.canonical_name "
+    "FROM geo_target_constant WHERE geo_target_constant.id IN ({ids})"
+)
+
+
+def _chunks(items: Iterable[int], size: int) -> List[List[int]]:
+    """Splits items into lists of at most size elements."""
+    items = list(items)
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def _fetch_geo_names(ga_service: Any, customer_id: str, ids: List[int]) -> Dict[int, str]:
+    """Returns the canonical name of each location ID."""
+    geo_query = _GEO_QUERY_TEMPLATE.format(ids=", ".join(map(str, ids)))
+    geo_stream = ga_service.search_stream(customer_id=customer_id, query=geo_query)
+    geo_map = {}
+    for batch in geo_stream:
+        for row in batch.results:
+            geo = row.geo_target_constant
+            geo_map[geo.id] = geo.canonical_name
+    return geo_map
+
+
+def _open_geo_cache(path: str) -> sqlite3.Connection:
+    """Opens the on-disk geo target cache, creating it if needed."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    db = sqlite3.connect(path)
+    db.execute(
+        "CREATE TABLE IF NOT EXISTS geo_canonical_name("
+        "id INTEGER PRIMARY KEY, canonical_name TEXT, fetched_at REAL)"
+    )
+    return db
+
+
+def _load_cached_geos(db: sqlite3.Connection, ids: Set[int]) -> Dict[int, str]:
+    """Returns the cached canonical names of the given IDs that are still fresh."""
+    oldest = time.time() - _GEO_CACHE_MAX_AGE_SECONDS
+    geo_map = {}
+    for chunk in _chunks(ids, _GEO_IDS_PER_QUERY):
+        placeholders = ", ".join("?" * len(chunk))
+        geo_map.update(db.execute(
+            "SELECT id, canonical_name FROM geo_canonical_name "
+            f"WHERE fetched_at >= ? AND id IN ({placeholders})",
+            [oldest, *chunk],
+        ))
+    return geo_map
+
+
+def _store_geos(db: sqlite3.Connection, geo_map: Dict[int, str]) -> None:
+    """Adds resolved canonical names to the cache."""
+    fetched_at = time.time()
+    with db:
+        db.executemany(
+            "INSERT OR REPLACE INTO geo_canonical_name VALUES (?, ?, ?)",
+            [(geo_id, name, fetched_at) for geo_id, name in geo_map.items()],
+        )
+
+
+def main(client: GoogleAdsClient, customer_id: str, geo_cache_path: Optional[str] = None) -> None:
+    """Prints each campaign's location targets.
+
+    With geo_cache_path, location names are read from and added to an sqlite
+    cache at that path, so only IDs missing from it, or cached more than 30
+    days ago, are queried.
+    """
+    ga_service = client.get_service("GoogleAdsService")
+
     try:
-        stream = ga_service.search_stream(customer_id=customer_id, query=query)
-        crit_map = {}
-        for batch in stream:
-            for row in batch.results:
-                crit_map[row.campaign_criterion.criterion_id] = (row.campaign.name, row.campaign_criterion.negative)
-        
-        if not crit_map:
+        stream = ga_service.search_stream(customer_id=customer_id, query=_CRITERIA_QUERY)
+        # Every criterion row is kept, since several campaigns can target the
+        # same location; the distinct IDs are resolved in one lookup below.
+        criteria = [_criterion_fields(row) for batch in stream for row in batch.results]
+        needed_ids = {criterion_id for _, criterion_id, _ in criteria}
+
+        if not criteria:
             print("No geo targets found.")
             return
 
-        # Bulk query for constants
-        ids = ", ".join([str(i) for i in crit_map.keys()])
-        geo_query = f"SELECT geo_target_constant.id, geo_target_constant.canonical_name FROM geo_target_constant WHERE geo_target_constant.id IN ({ids})"
-        geo_stream = ga_service.search_stream(customer_id=customer_id, query=geo_query)
-        
+        with contextlib.ExitStack() as stack:
+            db = None
+            geo_map = {}
+            if geo_cache_path:
+                db = stack.enter_context(contextlib.closing(_open_geo_cache(geo_cache_path)))
+                geo_map = _load_cached_geos(db, needed_ids)
+
+            # Bulk queries for constants
+            chunks = _chunks(needed_ids - geo_map.keys(), _GEO_IDS_PER_QUERY)
+            fetched = {}
+            if chunks:
+                with ThreadPoolExecutor(max_workers=min(_MAX_WORKERS, len(chunks))) as executor:
+                    futures = [
+                        executor.submit(_fetch_geo_names, ga_service, customer_id, chunk)
+                        for chunk in chunks
+                    ]
+                    for future in as_completed(futures):
+                        fetched.update(future.result())
+            if db is not None and fetched:
+                _store_geos(db, fetched)
+            geo_map.update(fetched)
+
         print(f"{'Campaign':<25} | {'Target':<30} | {'Negative'}")
         print("-" * 70)
-        for batch in geo_stream:
-            for row in batch.results:
-                cid = row.geo_target_constant.id
-                c_name, neg = crit_map[cid]
-                print(f"{c_name[:25]:<25} | {row.geo_target_constant.canonical_name[:30]:<30} | {neg}")
+        for c_name, criterion_id, neg in criteria:
+            canonical_name = geo_map.get(criterion_id, "Unknown")
+            print(f"{c_name[:25]:<25} | {canonical_name[:30]:<30} | {neg}")
     except GoogleAdsException as ex:
         print(f"Request ID {ex.request_id} failed: {ex.error.code().name}")
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("-c", "--customer_id", required=True)
+    parser.add_argument(
+        "--cache_path",
+        help="Optional sqlite file that caches location names across runs. "
+        "Entries are refreshed after 30 days.",
+    )
     parser.add_argument(
         "-v", "--api_version", type=str, required=True, help="The Google Ads API version."
     )
     args = parser.parse_args()
     client = GoogleAdsClient.load_from_storage(version=args.api_version)
-    main(client, args.customer_id)
+    main(client, args.customer_id, args.cache_path)
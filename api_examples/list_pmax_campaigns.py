@@ -20,6 +20,7 @@ import sys
 from google.ads.googleads.client import GoogleAdsClient
 from google.ads.googleads.errors import GoogleAdsException
 
+
 def main(client: GoogleAdsClient, customer_id: str) -> None:
     ga_service = client.get_service("GoogleAdsService")
     query = """
@@ -33,7 +34,9 @@ def main(client: GoogleAdsClient, customer_id: str) -> None:
             campaign
         WHERE
             campaign.advertising_channel_type = 'PERFORMANCE_MAX'
-            AND campaign.status != 'REMOVED'"""
+            AND campaign.status != 'REMOVED'
+        PARAMETERS
+            omit_unselected_resource_names = true"""
 
     try:
         response = ga_service.search_stream(customer_id=customer_id, query=query)
@@ -16,10 +16,18 @@
 """Parallel report downloader with optimized concurrency and retry logic."""
 
 import argparse
+import asyncio
+import contextlib
 import logging
+import queue
+import random
+import threading
+import time
 from concurrent import futures
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
 from google.ads.googleads.client import GoogleAdsClient
 from google.ads.googleads.errors import GoogleAdsException
@@ -28,28 +36,176 @@ logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(level
 logger = logging.getLogger(__name__)
 
 
+# Concurrent streams allowed per customer, so that many reports for one
+# account do not trip its rate quota. Calls rejected with RESOURCE_EXHAUSTED
+# are retried with exponential backoff.
+_PER_CUSTOMER_CONCURRENCY = 2
+_MAX_RETRIES = 5
+_BACKOFF_BASE_SECONDS = 1.0
+_BACKOFF_CAP_SECONDS = 30.0
+
+
+@dataclass(frozen=True, slots=True)
+class ReportResult:
+    """Outcome of one report for one customer."""
+
+    name: str
+    customer_id: str
+    row_count: int
+    exception: Optional[BaseException] = None
+
+
+@contextlib.contextmanager
+def _queued_logging() -> Iterator[None]:
+    """Hands this module's log records to a background thread for output.
+
+    Worker threads only enqueue records; formatting and the stream writes
+    happen on the listener thread, so workers never wait on the output lock.
+    """
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    handler = QueueHandler(log_queue)
+    listener = QueueListener(log_queue, *logging.getLogger().handlers, respect_handler_level=True)
+    propagate = logger.propagate
+    logger.addHandler(handler)
+    logger.propagate = False
+    listener.start()
+    try:
+        yield
+    finally:
+        listener.stop()
+        logger.removeHandler(handler)
+        logger.propagate = propagate
+
+
 def _get_date_range_strings() -> tuple[str, str]:
     """Computes a 7-day date range for reporting."""
-    end = datetime.now().strftime("%Y-%m-%d")
-    start = (datetime.now() - timedelta(days=7)).strftime("%Y-%m-%d")
-    return start, end
+    # Both ends come from one clock read, so a midnight rollover between
+    # reads cannot skew the window.
+    today = datetime.now()
+    return (today - timedelta(days=7)).strftime("%Y-%m-%d"), today.strftime("%Y-%m-%d")
+
+
+def _is_quota_error(ex: GoogleAdsException) -> bool:
+    """Returns whether the request was rejected for exceeding a rate quota."""
+    return ex.error.code().name == "RESOURCE_EXHAUSTED"
+
 
+def _backoff_delay(attempt: int) -> float:
+    """Returns the exponential backoff, with jitter, before retry number attempt."""
+    return min(_BACKOFF_CAP_SECONDS, _BACKOFF_BASE_SECONDS * 2**attempt + random.random())
 
-def fetch_report_threaded(client: GoogleAdsClient, customer_id: str, query: str, log_tag: str) -> Dict:
-    """Fetches a report using search_stream for memory efficiency."""
+
+def fetch_report_threaded(
+    ga_service: Any,
+    customer_id: str,
+    query: str,
+    log_tag: str,
+    on_row: Optional[Callable[[Any], None]] = None,
+    semaphore: Optional[threading.Semaphore] = None,
+) -> Dict:
+    """Fetches a report using search_stream for memory efficiency.
+
+    The GoogleAdsService client is created once by the caller and shared by
+    every worker thread; its gRPC channel is thread-safe. Rows are handed to
+    on_row as they arrive and never collected, so memory stays flat however
+    large the report is; without on_row they are only counted.
+
+    The stream is held open under semaphore, which bounds the calls in flight
+    for one customer. A RESOURCE_EXHAUSTED failure is retried with backoff as
+    long as no rows have been delivered yet.
+    """
     logger.info("Fetching for customer %s [%s]", customer_id, log_tag)
-    ga_service = client.get_service("GoogleAdsService")
-    try:
-        stream = ga_service.search_stream(customer_id=customer_id, query=query)
-        rows = []
-        for batch in stream:
-            for row in batch.results:
-                rows.append(row)
-        logger.info("Completed. Found %d rows.", len(rows))
-        return {"customer_id": customer_id, "rows": rows}
-    except GoogleAdsException as ex:
-        logger.error("Request ID %s failed for customer %s", ex.request_id, customer_id)
-        raise
+    attempt = 0
+    while True:
+        row_count = 0
+        try:
+            with semaphore or contextlib.nullcontext():
+                stream = ga_service.search_stream(customer_id=customer_id, query=query)
+                for batch in stream:
+                    results = batch.results
+                    if on_row is not None:
+                        for row in results:
+                            on_row(row)
+                    row_count += len(results)
+            logger.info("Completed. Found %d rows.", row_count)
+            return {"customer_id": customer_id, "row_count": row_count}
+        except GoogleAdsException as ex:
+            if _is_quota_error(ex) and row_count == 0 and attempt < _MAX_RETRIES:
+                delay = _backoff_delay(attempt)
+                attempt += 1
+                logger.warning("Quota exhausted for customer %s; retrying in %.1fs", customer_id, delay)
+                time.sleep(delay)
+                continue
+            logger.error("Request ID %s failed for customer %s", ex.request_id, customer_id)
+            raise
+
+
+async def fetch_report(
+    ga_service: Any,
+    customer_id: str,
+    query: str,
+    log_tag: str,
+    on_row: Optional[Callable[[Any], None]] = None,
+    semaphore: Optional[asyncio.Semaphore] = None,
+) -> Dict:
+    """Fetches a report on the asyncio GoogleAdsService client.
+
+    Rows, the semaphore and quota retries are handled exactly as in
+    fetch_report_threaded.
+    """
+    logger.info("Fetching for customer %s [%s]", customer_id, log_tag)
+    attempt = 0
+    while True:
+        row_count = 0
+        try:
+            async with semaphore or contextlib.nullcontext():
+                stream = await ga_service.search_stream(customer_id=customer_id, query=query)
+                async for batch in stream:
+                    results = batch.results
+                    if on_row is not None:
+                        for row in results:
+                            on_row(row)
+                    row_count += len(results)
+            logger.info("Completed. Found %d rows.", row_count)
+            return {"customer_id": customer_id, "row_count": row_count}
+        except GoogleAdsException as ex:
+            if _is_quota_error(ex) and row_count == 0 and attempt < _MAX_RETRIES:
+                delay = _backoff_delay(attempt)
+                attempt += 1
+                logger.warning("Quota exhausted for customer %s; retrying in %.1fs", customer_id, delay)
+                await asyncio.sleep(delay)
+                continue
+            logger.error("Request ID %s failed for customer %s", ex.request_id, customer_id)
+            raise
+
+
+async def _fetch_reports_async(
+    client: GoogleAdsClient, tasks: List[Tuple[str, Dict[str, str]]]
+) -> List[ReportResult]:
+    """Runs every report on one event loop, all streams in flight at once.
+
+    Streams per customer are still capped by a per-customer semaphore.
+    """
+    # A grpc.aio channel is bound to the event loop it is created on, so the
+    # async service is looked up here rather than in main.
+    ga_service = client.get_service("GoogleAdsService", is_async=True)
+    semaphores = {cid: asyncio.Semaphore(_PER_CUSTOMER_CONCURRENCY) for cid, _ in tasks}
+    results = await asyncio.gather(
+        *(
+            fetch_report(ga_service, cid, rd["query"], rd["name"], semaphore=semaphores[cid])
+            for cid, rd in tasks
+        ),
+        return_exceptions=True,
+    )
+    all_results = []
+    for (cid, rd), result in zip(tasks, results):
+        if isinstance(result, BaseException):
+            logger.warning("Report %s for customer %s failed.", rd["name"], cid)
+            all_results.append(ReportResult(rd["name"], cid, 0, result))
+        else:
+            logger.info("Finished processing %s for customer %s", rd["name"], cid)
+            all_results.append(ReportResult(rd["name"], cid, result["row_count"]))
+    return all_results
 
 
 def main(
@@ -57,9 +213,20 @@ def main(
     login_id: Optional[str],
     api_version: str,
     workers: int = 5,
-) -> None:
-    """Main execution loop for parallel report retrieval."""
-    client = GoogleAdsClient.load_from_storage(version=api_version)
+    use_async: bool = False,
+) -> List[ReportResult]:
+    """Main execution loop for parallel report retrieval.
+
+    Returns one ReportResult per customer and report, in completion order for
+    the threaded path and in submission order for the asyncio path.
+
+    With use_async the reports are multiplexed on a single asyncio event loop
+    instead of a pool of worker threads, so the number of concurrent streams
+    is not capped by workers.
+    """
+    # Rows are only counted here, so the client hands back raw protobuf
+    # messages rather than wrapping every row in proto-plus.
+    client = GoogleAdsClient.load_from_storage(version=api_version, use_proto_plus=False)
     if login_id:
         client.login_customer_id = login_id
 
@@ -68,13 +235,26 @@ def main(
     report_defs = [
         {
             "name": "Campaign_Performance",
-            "query": f"SELECT campaign.id, metrics.clicks FROM campaign WHERE segments.date BETWEEN '{start}' AND '{end}' LIMIT 5",
+            # Resource names are only returned for the selected resources.
+            "query": f"SELECT campaign.id, metrics.clicks FROM campaign WHERE segments.date BETWEEN '{start}' AND '{end}' LIMIT 5 "
+            "PARAMETERS omit_unselected_resource_names = true",
         }
     ]
 
-    with futures.ThreadPoolExecutor(max_workers=workers) as executor:
+    if use_async:
+        tasks = [(cid, rd) for cid in customer_ids for rd in report_defs]
+        return asyncio.run(_fetch_reports_async(client, tasks))
+
+    ga_service = client.get_service("GoogleAdsService")
+    all_results: List[ReportResult] = []
+
+    semaphores = {cid: threading.Semaphore(_PER_CUSTOMER_CONCURRENCY) for cid in customer_ids}
+    with _queued_logging(), futures.ThreadPoolExecutor(max_workers=workers) as executor:
         future_to_report = {
-            executor.submit(fetch_report_threaded, client, cid, rd["query"], rd["name"]): (
+            executor.submit(
+                fetch_report_threaded, ga_service, cid, rd["query"], rd["name"],
+                semaphore=semaphores[cid],
+            ): (
                 cid,
                 rd["name"],
             )
@@ -85,10 +265,13 @@ def main(
         for future in futures.as_completed(future_to_report):
             cid, name = future_to_report[future]
             try:
-                future.result()
+                result = future.result()
                 logger.info("Finished processing %s for customer %s", name, cid)
-            except Exception:
+                all_results.append(ReportResult(name, cid, result["row_count"]))
+            except Exception as ex:
                 logger.warning("Report %s for customer %s failed.", name, cid)
+                all_results.append(ReportResult(name, cid, 0, ex))
+    return all_results
 
 
 if __name__ == "__main__":
@@ -96,8 +279,13 @@ if __name__ == "__main__":
     parser.add_argument("-c", "--customer_ids", nargs="+", required=True)
     parser.add_argument("-l", "--login_id")
     parser.add_argument("-w", "--workers", type=int, default=5)
+    parser.add_argument(
+        "--use_async",
+        action="store_true",
+        help="Run the reports concurrently on an asyncio event loop instead of threads.",
+    )
     parser.add_argument(
         "-v", "--api_version", type=str, required=True, help="The Google Ads API version."
     )
     args = parser.parse_args()
-    main(args.customer_ids, args.login_id, args.api_version, args.workers)
+    main(args.customer_ids, args.login_id, args.api_version, args.workers, args.use_async)
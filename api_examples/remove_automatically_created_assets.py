@@ -16,31 +16,100 @@
 """Removes automatically created assets using the dedicated service."""
 
 import argparse
+import functools
+import sys
+from typing import Any, Dict, List, NamedTuple
+
 from google.ads.googleads.client import GoogleAdsClient
 from google.ads.googleads.errors import GoogleAdsException
 
-def main(client: GoogleAdsClient, customer_id: str, campaign_id: str, asset_rn: str, field_type: str) -> None:
+
+class RemovalSpec(NamedTuple):
+    """One automatically created asset to remove from a campaign."""
+
+    campaign_id: str
+    asset_rn: str
+    field_type: str
+
+
+@functools.lru_cache(maxsize=None)
+def _field_types(asset_field_type_enum: Any) -> Dict[str, Any]:
+    """Maps each removable field type name to its enum value.
+
+    Built once per enum class, so neither a lookup nor the error message's
+    list of valid names reflects over the enum again.
+    """
+    return {
+        field_type.name: field_type
+        for field_type in asset_field_type_enum
+        if field_type.name not in ("UNSPECIFIED", "UNKNOWN")
+    }
+
+
+def main(client: GoogleAdsClient, customer_id: str, removals: List[RemovalSpec]) -> None:
+    """Removes every requested asset with a single RPC.
+
+    Partial failure is enabled so that one bad removal does not roll back the
+    rest of the batch.
+    """
     service = client.get_service("AutomaticallyCreatedAssetRemovalService")
-    op = client.get_type("RemoveCampaignAutomaticallyCreatedAssetOperation")
-    op.campaign = client.get_service("CampaignService").campaign_path(customer_id, campaign_id)
-    op.asset = asset_rn
-    op.field_type = getattr(client.enums.AssetFieldTypeEnum.AssetFieldType, field_type.upper())
+    campaign_service = client.get_service("CampaignService")
+    field_types = _field_types(client.enums.AssetFieldTypeEnum.AssetFieldType)
+
+    operations = []
+    for spec in removals:
+        op = client.get_type("RemoveCampaignAutomaticallyCreatedAssetOperation")
+        op.campaign = campaign_service.campaign_path(customer_id, spec.campaign_id)
+        op.asset = spec.asset_rn
+        try:
+            op.field_type = field_types[spec.field_type.upper()]
+        except KeyError:
+            print(
+                f"Invalid field type '{spec.field_type}'. "
+                f"Valid field types: {', '.join(field_types)}"
+            )
+            sys.exit(1)
+        operations.append(op)
 
     try:
-        res = service.remove_campaign_automatically_created_asset(customer_id=customer_id, operations=[op])
-        print(f"Removed {len(res.results)} assets.")
+        res = service.remove_campaign_automatically_created_asset(
+            customer_id=customer_id, operations=operations, partial_failure=True
+        )
+        # The response carries no per-operation results, only the partial
+        # failure error when some removals were rejected.
+        if res.partial_failure_error.message:
+            print(f"Some removals failed: {res.partial_failure_error.message}")
+        else:
+            print(f"Removed {len(operations)} assets.")
     except GoogleAdsException as ex:
         print(f"Request ID {ex.request_id} failed: {ex.error.code().name}")
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("-c", "--customer_id", required=True)
-    parser.add_argument("-C", "--campaign_id", required=True)
-    parser.add_argument("-a", "--asset_rn", required=True)
-    parser.add_argument("-f", "--field_type", required=True)
+    parser.add_argument("-C", "--campaign_id")
+    parser.add_argument("-a", "--asset_rn")
+    parser.add_argument("-f", "--field_type")
+    parser.add_argument(
+        "-r",
+        "--removal",
+        nargs=3,
+        action="append",
+        default=[],
+        metavar=("CAMPAIGN_ID", "ASSET_RN", "FIELD_TYPE"),
+        help="An asset to remove; repeat to remove several in one request.",
+    )
     parser.add_argument(
         "-v", "--api_version", type=str, required=True, help="The Google Ads API version."
     )
     args = parser.parse_args()
+    removals = [RemovalSpec(*removal) for removal in args.removal]
+    single = (args.campaign_id, args.asset_rn, args.field_type)
+    if any(single) and not all(single):
+        parser.error("--campaign_id, --asset_rn and --field_type must be passed together.")
+    if all(single):
+        removals.insert(0, RemovalSpec(*single))
+    if not removals:
+        parser.error("Pass --campaign_id, --asset_rn and --field_type, or at least one --removal.")
     client = GoogleAdsClient.load_from_storage(version=args.api_version)
-    main(client, args.customer_id, args.campaign_id, args.asset_rn, args.field_type)
+    main(client, args.customer_id, removals)
@@ -22,10 +22,12 @@ from google.ads.googleads.errors import GoogleAdsException
 
 def main(client: GoogleAdsClient, customer_id: str, campaign_id: str, user_list_id: str) -> None:
     service = client.get_service("CampaignCriterionService")
+    campaign_service = client.get_service("CampaignService")
+    user_list_service = client.get_service("UserListService")
     op = client.get_type("CampaignCriterionOperation")
     crit = op.create
-    crit.campaign = client.get_service("CampaignService").campaign_path(customer_id, campaign_id)
-    crit.user_list.user_list = client.get_service("UserListService").user_list_path(customer_id, user_list_id)
+    crit.campaign = campaign_service.campaign_path(customer_id, campaign_id)
+    crit.user_list.user_list = user_list_service.user_list_path(customer_id, user_list_id)
 
     try:
         res = service.mutate_campaign_criteria(customer_id=customer_id, operations=[op])
@@ -0,0 +1,44 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test doubles shared by the api_examples tests."""
+
+from types import SimpleNamespace
+
+from google.ads.googleads.errors import GoogleAdsException
+
+
+class _ErrCode:
+    # Stands in for the grpc status code: the scripts call error.code(), so
+    # both the class and its instances expose the name.
+    name = "REQUEST_ERROR"
+
+
+def canned_google_ads_exception():
+    """Builds a fresh GoogleAdsException for a test to raise."""
+    return GoogleAdsException(
+        error=SimpleNamespace(code=_ErrCode),
+        failure=SimpleNamespace(
+            errors=[
+                SimpleNamespace(
+                    message="Error details",
+                    location=SimpleNamespace(
+                        field_path_elements=[SimpleNamespace(field_name="test_field")]
+                    ),
+                )
+            ]
+        ),
+        request_id="test_request_id",
+        call=None,
+    )
@@ -14,12 +14,10 @@
 # limitations under the License.
 
 import unittest
-from unittest.mock import MagicMock
-import sys
-import os
+from unittest.mock import MagicMock, patch
+from io import StringIO
 
-# Add the project root to sys.path
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from api_examples.tests._helpers import canned_google_ads_exception
 
 # Import the main function from the example script
 from api_examples import add_campaign_with_date_times
@@ -28,6 +26,7 @@ class TestAddCampaignWithDateTimes(unittest.TestCase):
     def setUp(self):
         self.mock_client = MagicMock()
         self.customer_id = "1234567890"
+        add_campaign_with_date_times._get_service.cache_clear()
 
     def test_main(self):
         # Mock services
@@ -78,11 +77,127 @@ class TestAddCampaignWithDateTimes(unittest.TestCase):
         mock_campaign_service.mutate_campaigns.assert_called_once()
         
         # Check if created campaign has start_date_time and end_date_time set
-        created_campaign = mock_campaign_operation.create
-        self.assertTrue(hasattr(created_campaign, "start_date_time"))
-        self.assertTrue(hasattr(created_campaign, "end_date_time"))
-        self.assertIsNotNone(created_campaign.start_date_time)
-        self.assertIsNotNone(created_campaign.end_date_time)
+        campaign_operation = mock_campaign_service.mutate_campaigns.call_args.kwargs[
+            "operations"
+        ][0]
+        created_campaign = campaign_operation.create
+        for date_time in (created_campaign.start_date_time, created_campaign.end_date_time):
+            self.assertRegex(date_time, r"^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}$")
+        self.assertEqual(created_campaign.campaign_budget, "budget_resource_name")
+
+    def test_main_reuses_cached_lookups(self):
+        self.mock_client.get_service.return_value.mutate_campaign_budgets.return_value.results = [
+            MagicMock(resource_name="budget_resource_name")
+        ]
+
+        add_campaign_with_date_times.main(self.mock_client, self.customer_id)
+        add_campaign_with_date_times.main(self.mock_client, self.customer_id)
+
+        self.assertEqual(self.mock_client.get_service.call_count, 2)
+        # Each call builds fresh operations rather than reusing cleared ones.
+        self.assertEqual(self.mock_client.get_type.call_count, 4)
+
+    def test_add_campaigns_for_customers(self):
+        mock_campaign_budget_service = MagicMock()
+        mock_campaign_service = MagicMock()
+        self.mock_client.get_service.side_effect = lambda name: {
+            "CampaignBudgetService": mock_campaign_budget_service,
+            "CampaignService": mock_campaign_service,
+        }[name]
+        self.mock_client.get_type.side_effect = lambda name: MagicMock()
+        mock_campaign_budget_service.mutate_campaign_budgets.side_effect = (
+            lambda customer_id, operations: MagicMock(
+                results=[MagicMock(resource_name=f"budget_{customer_id}")]
+            )
+        )
+        # Record the budget each customer's campaign was created with.
+        created = {}
+
+        def mutate_campaigns(customer_id, operations):
+            created[customer_id] = operations[0].create.campaign_budget
+            return MagicMock()
+
+        mock_campaign_service.mutate_campaigns.side_effect = mutate_campaigns
+
+        customer_ids = ["111", "222", "333"]
+        add_campaign_with_date_times.add_campaigns_for_customers(
+            self.mock_client, customer_ids
+        )
+
+        self.assertEqual(
+            mock_campaign_budget_service.mutate_campaign_budgets.call_count, 3
+        )
+        self.assertEqual(
+            created,
+            {"111": "budget_111", "222": "budget_222", "333": "budget_333"},
+        )
+
+    def test_add_campaigns_for_customers_continues_after_a_failure(self):
+        mock_campaign_budget_service = MagicMock()
+        mock_campaign_service = MagicMock()
+        self.mock_client.get_service.side_effect = lambda name: {
+            "CampaignBudgetService": mock_campaign_budget_service,
+            "CampaignService": mock_campaign_service,
+        }[name]
+        self.mock_client.get_type.side_effect = lambda name: MagicMock()
+
+        def mutate_campaign_budgets(customer_id, operations):
+            if customer_id == "222":
+                raise canned_google_ads_exception()
+            return MagicMock(results=[MagicMock(resource_name=f"budget_{customer_id}")])
+
+        mock_campaign_budget_service.mutate_campaign_budgets.side_effect = (
+            mutate_campaign_budgets
+        )
+        created = {}
+
+        def mutate_campaigns(customer_id, operations):
+            created[customer_id] = operations[0].create.campaign_budget
+            return MagicMock()
+
+        mock_campaign_service.mutate_campaigns.side_effect = mutate_campaigns
+
+        with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+            with self.assertRaises(SystemExit) as cm:
+                add_campaign_with_date_times.add_campaigns_for_customers(
+                    self.mock_client, ["111", "222", "333"]
+                )
+
+        self.assertEqual(cm.exception.code, 1)
+        # The budgets that succeeded still get their campaigns.
+        self.assertEqual(created, {"111": "budget_111", "333": "budget_333"})
+        self.assertIn("Request with ID 'test_request_id' failed", mock_stdout.getvalue())
+
+    def test_handle_google_ads_exception(self):
+        mock_exception = MagicMock(request_id="test_request_id")
+        mock_exception.error.code.return_value.name = "REQUEST_ERROR"
+        mock_exception.failure.errors = [
+            MagicMock(
+                message="Error details",
+                location=MagicMock(
+                    field_path_elements=[
+                        MagicMock(field_name="operations"),
+                        MagicMock(field_name="create"),
+                    ]
+                ),
+            )
+        ]
+
+        with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+            with self.assertRaises(SystemExit) as cm:
+                add_campaign_with_date_times._handle_google_ads_exception(
+                    mock_exception
+                )
+
+        self.assertEqual(cm.exception.code, 1)
+        self.assertEqual(
+            mock_stdout.getvalue(),
+            "Request with ID 'test_request_id' failed with status 'REQUEST_ERROR' "
+            "and includes the following errors:\n"
+            "\tError with message 'Error details'.\n"
+            "\t\tOn field: operations\n"
+            "\t\tOn field: create\n",
+        )
 
 if __name__ == "__main__":
     unittest.main()
@@ -12,125 +12,302 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import sys
+import asyncio
+import contextlib
+import importlib.util
 import os
-
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+import re
+import tempfile
+from datetime import date
+from types import SimpleNamespace
 
 import unittest
-from unittest.mock import MagicMock, patch, mock_open
+from unittest.mock import DEFAULT, AsyncMock, MagicMock, patch
 from io import StringIO
 
-from google.ads.googleads.errors import GoogleAdsException
 from google.ads.googleads.client import GoogleAdsClient
 
+from api_examples.tests._helpers import canned_google_ads_exception
+
 # Import functions from the script
 from api_examples.ai_max_reports import (
     main,
     _write_to_csv,
     get_campaign_details,
+    get_campaign_details_async,
     get_search_terms,
+    get_search_terms_async,
+)
+
+
+@contextlib.contextmanager
+def _capture_open():
+    """Patches open to return one in-memory buffer whose contents outlive close()."""
+    buf = StringIO()
+    buf.close = lambda: None
+    with patch("builtins.open", return_value=buf) as mock_file_open:
+        yield buf, mock_file_open
+
+
+def _search_term_row(term, impressions, clicks, conversions):
+    """Builds a plain stand-in for a search terms GoogleAdsRow."""
+    return SimpleNamespace(
+        campaign=SimpleNamespace(id=789, name="AI Max Campaign 3"),
+        ai_max_search_term_ad_combination_view=SimpleNamespace(search_term=term),
+        metrics=SimpleNamespace(impressions=impressions, clicks=clicks, conversions=conversions),
+    )
+
+
+class _FrozenDate(date):
+    """Pins date.today() so the report date windows are deterministic."""
+
+    @classmethod
+    def today(cls):
+        return cls(2026, 2, 16)
+
+
+def _campaign_details_stream():
+    """Returns the stream the campaign details report reads."""
+    row = SimpleNamespace(
+        campaign=SimpleNamespace(
+            id=123,
+            name="AI Max Campaign 1",
+            ai_max_setting=SimpleNamespace(enable_ai_max=True),
+        ),
+        expanded_landing_page_view=SimpleNamespace(expanded_final_url="http://example.com"),
+    )
+    return [SimpleNamespace(results=[row])]
+
+
+# One row per search term and ad combination, so a term can repeat; the
+# rows arrive already ordered by impressions.
+_SEARCH_TERM_BATCHES = (
+    SimpleNamespace(
+        results=[
+            _search_term_row("other term", 1500, 20, 2.0),
+            _search_term_row("test search term", 1000, 50, 5.0),
+        ]
+    ),
+    SimpleNamespace(results=[_search_term_row("test search term", 200, 10, 1.0)]),
+)
+_SEARCH_TERMS_CSV = (
+    "ID,Name,Term,Impr,Clicks,Conv\r\n"
+    "789,AI Max Campaign 3,other term,1500,20,2.0\r\n"
+    "789,AI Max Campaign 3,test search term,1000,50,5.0\r\n"
+    "789,AI Max Campaign 3,test search term,200,10,1.0\r\n"
+)
+
+
+def _search_terms_stream():
+    """Returns the stream the search terms report reads."""
+    return list(_SEARCH_TERM_BATCHES)
+
+
+# (name, report function, stream factory, whitespace-free query fragments,
+#  expected CSV); dates assume _FrozenDate.
+_REPORT_CASES = (
+    (
+        "campaign_details",
+        get_campaign_details,
+        _campaign_details_stream,
+        ("FROMexpanded_landing_page_view", "campaign.ai_max_setting.enable_ai_max=TRUE"),
+        "ID,Name,URL,Enabled\r\n123,AI Max Campaign 1,http://example.com,True\r\n",
+    ),
+    (
+        "search_terms",
+        get_search_terms,
+        _search_terms_stream,
+        (
+            "FROMai_max_search_term_ad_combination_view",
+            "segments.dateBETWEEN'2026-01-17'",
+            "AND'2026-02-16'",
+            "ORDERBYmetrics.impressionsDESC",
+        ),
+        _SEARCH_TERMS_CSV,
+    ),
 )
 
 
 class TestAIMaxReports(unittest.TestCase):
+    # Collapses all whitespace so query checks ignore formatting.
+    _WS_RE = re.compile(r"\s+")
+
+    @classmethod
+    def setUpClass(cls):
+        # Specing against the class makes every MagicMock walk and inspect
+        # all of GoogleAdsClient's attributes; the names are gathered once
+        # here and each test's mock is specced against the list instead.
+        cls._client_spec = dir(GoogleAdsClient)
+        # The service mock is built once and reset between tests.
+        cls._ga_service = MagicMock()
+
     def setUp(self):
-        self.mock_client = MagicMock(spec=GoogleAdsClient)
-        self.mock_ga_service = MagicMock()
+        self.mock_client = MagicMock(spec=self._client_spec)
+        self._ga_service.reset_mock(return_value=True, side_effect=True)
+        self.mock_ga_service = self._ga_service
         self.mock_client.get_service.return_value = self.mock_ga_service
         self.customer_id = "1234567890"
-        self.captured_output = StringIO()
-        sys.stdout = self.captured_output
-
-    def tearDown(self):
-        sys.stdout = sys.__stdout__
+        # Only main resolves the report functions through the module, so
+        # the direct tests below still exercise the real implementations;
+        # date is frozen for every test.
+        patches = patch.multiple(
+            "api_examples.ai_max_reports",
+            get_campaign_details=DEFAULT,
+            get_search_terms=DEFAULT,
+            get_campaign_details_async=DEFAULT,
+            get_search_terms_async=DEFAULT,
+            date=_FrozenDate,
+        )
+        self.mocks = patches.start()
+        self.addCleanup(patches.stop)
 
     # --- Test _write_to_csv ---
-    @patch("builtins.open", new_callable=mock_open)
-    def test_write_to_csv(self, mock_file_open):
+    def test_write_to_csv(self):
         headers = ["Header1", "Header2"]
-        rows = [["Value1", "ValueA"], ["Value2", "ValueB"]]
+        stream = [
+            SimpleNamespace(results=[("Value1", "ValueA")]),
+            SimpleNamespace(results=[("Value2", "ValueB")]),
+        ]
 
         file_path = "test.csv"
-        _write_to_csv(file_path, headers, rows)
+        output = StringIO()
+        with _capture_open() as (buf, mock_file_open), contextlib.redirect_stdout(output):
+            _write_to_csv(file_path, headers, stream, tuple)
 
         mock_file_open.assert_called_once_with(
-            file_path, "w", newline="", encoding="utf-8"
+            file_path, "w", newline="", encoding="utf-8", buffering=1 << 20
+        )
+        self.assertEqual(
+            buf.getvalue(), "Header1,Header2\r\nValue1,ValueA\r\nValue2,ValueB\r\n"
         )
-        handle = mock_file_open()
-        handle.write.assert_any_call("Header1,Header2\r\n")
-        handle.write.assert_any_call("Value1,ValueA\r\n")
-        handle.write.assert_any_call("Value2,ValueB\r\n")
-        self.assertIn(f"Report written to {file_path}", self.captured_output.getvalue())
-
-    # --- Test get_campaign_details ---
-    def test_get_campaign_details(self):
-        mock_row = MagicMock()
-        mock_row.campaign.id = 123
-        mock_row.campaign.name = "AI Max Campaign 1"
-        mock_row.expanded_landing_page_view.expanded_final_url = "http://example.com"
-        mock_row.campaign.ai_max_setting.enable_ai_max = True
-
-        mock_batch = MagicMock()
-        mock_batch.results = [mock_row]
-
-        self.mock_ga_service.search_stream.return_value = [mock_batch]
-
-        with patch("builtins.open", new_callable=mock_open) as mock_file_open:
-            get_campaign_details(self.mock_client, self.customer_id)
-
-            self.mock_ga_service.search_stream.assert_called_once()
-            handle = mock_file_open()
-            handle.write.assert_any_call("ID,Name,URL,Enabled\r\n")
-            handle.write.assert_any_call("123,AI Max Campaign 1,http://example.com,True\r\n")
-
-    # --- Test get_search_terms ---
-    def test_get_search_terms(self):
-        mock_row = MagicMock()
-        mock_row.campaign.id = 789
-        mock_row.campaign.name = "AI Max Campaign 3"
-        mock_row.ai_max_search_term_ad_combination_view.search_term = "test search term"
-        mock_row.metrics.impressions = 1000
-        mock_row.metrics.clicks = 50
-        mock_row.metrics.conversions = 5.0
-
-        mock_batch = MagicMock()
-        mock_batch.results = [mock_row]
-
-        self.mock_ga_service.search_stream.return_value = [mock_batch]
-
-        with patch("builtins.open", new_callable=mock_open) as mock_file_open:
-            get_search_terms(self.mock_client, self.customer_id)
-
-            self.mock_ga_service.search_stream.assert_called_once()
-            handle = mock_file_open()
-            handle.write.assert_any_call("ID,Name,Term,Impr,Clicks,Conv\r\n")
-            handle.write.assert_any_call("789,AI Max Campaign 3,test search term,1000,50,5.0\r\n")
+        self.assertIn(f"Report written to {file_path}", output.getvalue())
+
+    @unittest.skipUnless(importlib.util.find_spec("pyarrow"), "pyarrow is not installed")
+    def test_write_to_csv_pyarrow_backend_matches_csv(self):
+        # The Name column is numeric in the first batch and text later, and
+        # only some batches need quoting, so the writer must not infer types
+        # per batch or quote differently from csv.writer.
+        stream = [
+            SimpleNamespace(results=[(1, 1234, 2.5, True)]),
+            SimpleNamespace(results=[]),
+            SimpleNamespace(results=[(2, 'Quoted "name", with comma', None, False)]),
+            SimpleNamespace(results=[(3, "Plain", 0.0, None), (4, "Café", 10, True)]),
+            SimpleNamespace(results=[(5, "line\nbreak", -1.5, False)]),
+        ]
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            outputs = []
+            for backend in ("csv", "pyarrow"):
+                file_path = os.path.join(tmp_dir, f"{backend}.csv")
+                with contextlib.redirect_stdout(StringIO()):
+                    _write_to_csv(file_path, ["ID", "Name", "Value", "Flag"], stream, tuple, backend)
+                with open(file_path, "rb") as f:
+                    outputs.append(f.read())
+
+        self.assertEqual(outputs[0], outputs[1])
+
+    def test_write_to_csv_raw_backend_matches_csv(self):
+        stream = [
+            SimpleNamespace(results=[(1, "Plain", 2.5, True)]),
+            SimpleNamespace(results=[(2, 'Quoted "name", with comma', None, False)]),
+            SimpleNamespace(results=[(3, "Café\nnewline", 0.0, True)]),
+        ]
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            outputs = []
+            for backend in ("csv", "raw"):
+                file_path = os.path.join(tmp_dir, f"{backend}.csv")
+                _write_to_csv(file_path, ["ID", "Name", "Value", "Flag"], stream, tuple, backend)
+                with open(file_path, "rb") as f:
+                    outputs.append(f.read())
+
+        self.assertEqual(outputs[0], outputs[1])
+
+    # --- Test get_campaign_details and get_search_terms ---
+    def test_get_reports(self):
+        for name, report_fn, make_stream, fragments, expected in _REPORT_CASES:
+            with self.subTest(name):
+                self.mock_ga_service.reset_mock()
+                self.mock_ga_service.search_stream.return_value = make_stream()
+
+                with _capture_open() as (buf, _):
+                    report_fn(self.mock_ga_service, self.customer_id)
+
+                self.mock_ga_service.search_stream.assert_called_once()
+                query = self.mock_ga_service.search_stream.call_args.kwargs["query"]
+                normalized = self._WS_RE.sub("", query)
+                for fragment in fragments:
+                    self.assertIn(fragment, normalized)
+                self.assertEqual(buf.getvalue(), expected)
+
+    def test_get_search_terms_sync_and_async_match(self):
+        async def stream():
+            for batch in _SEARCH_TERM_BATCHES:
+                yield batch
+
+        outputs, queries = [], []
+        for use_async in (False, True):
+            self.mock_ga_service.reset_mock()
+            # The shared service mock is reset, not rebuilt, so the async call
+            # is routed through side_effect instead of replacing search_stream.
+            self.mock_ga_service.search_stream.side_effect = (
+                AsyncMock(return_value=stream()) if use_async else [iter(_SEARCH_TERM_BATCHES)]
+            )
+
+            with _capture_open() as (buf, _):
+                if use_async:
+                    asyncio.run(get_search_terms_async(self.mock_ga_service, self.customer_id))
+                else:
+                    get_search_terms(self.mock_ga_service, self.customer_id)
+
+            outputs.append(buf.getvalue())
+            queries.append(self.mock_ga_service.search_stream.call_args.kwargs["query"])
+
+        self.assertEqual(outputs, [_SEARCH_TERMS_CSV, _SEARCH_TERMS_CSV])
+        self.assertEqual(queries[0], queries[1])
 
     # --- Test main function ---
     def test_main_campaign_details_report(self):
-        with patch("api_examples.ai_max_reports.get_campaign_details") as mock_get_campaign_details:
-            main(self.mock_client, self.customer_id, "campaign_details")
-            mock_get_campaign_details.assert_called_once_with(self.mock_client, self.customer_id)
+        main(self.mock_client, self.customer_id, "campaign_details")
+        self.mock_client.get_service.assert_called_once_with("GoogleAdsService")
+        self.mocks["get_campaign_details"].assert_called_once_with(
+            self.mock_ga_service, self.customer_id, backend="csv"
+        )
+        self.mocks["get_search_terms"].assert_not_called()
 
     def test_main_search_terms_report(self):
-        with patch("api_examples.ai_max_reports.get_search_terms") as mock_get_search_terms:
-            main(self.mock_client, self.customer_id, "search_terms")
-            mock_get_search_terms.assert_called_once_with(self.mock_client, self.customer_id)
+        main(self.mock_client, self.customer_id, "search_terms")
+        self.mocks["get_search_terms"].assert_called_once_with(
+            self.mock_ga_service, self.customer_id, backend="csv"
+        )
+        self.mocks["get_campaign_details"].assert_not_called()
 
-    def test_main_google_ads_exception(self):
-        mock_error = MagicMock()
-        mock_error.code.return_value.name = "REQUEST_ERROR"
-        
-        self.mock_ga_service.search_stream.side_effect = GoogleAdsException(
-            error=mock_error,
-            failure=MagicMock(errors=[MagicMock(message="Error details")]),
-            request_id="test_request_id",
-            call=MagicMock(),
+    def test_main_async_creates_service_inside_event_loop(self):
+        # grpc.aio channels are bound to the loop they are created on, so the
+        # async service must not be built before asyncio.run starts the loop.
+        loops = []
+
+        def get_service(*args, **kwargs):
+            loops.append(asyncio.get_running_loop())
+            return self.mock_ga_service
+
+        self.mock_client.get_service.side_effect = get_service
+        main(self.mock_client, self.customer_id, "search_terms", use_async=True)
+
+        self.assertEqual(len(loops), 1)
+        self.mock_client.get_service.assert_called_once_with("GoogleAdsService", is_async=True)
+        self.mocks["get_search_terms_async"].assert_awaited_once_with(
+            self.mock_ga_service, self.customer_id
         )
+        self.mocks["get_search_terms"].assert_not_called()
 
-        main(self.mock_client, self.customer_id, "campaign_details")
-        self.assertIn("Request ID test_request_id failed: REQUEST_ERROR", self.captured_output.getvalue())
+    def test_main_google_ads_exception(self):
+        self.mocks["get_campaign_details"].side_effect = canned_google_ads_exception()
+
+        output = StringIO()
+        with contextlib.redirect_stdout(output):
+            main(self.mock_client, self.customer_id, "campaign_details")
+        self.assertIn("Request ID test_request_id failed: REQUEST_ERROR", output.getvalue())
 
 
 if __name__ == "__main__":
@@ -13,102 +13,117 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import sys
-import os
-
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from contextlib import redirect_stdout
+from types import SimpleNamespace
 
 import unittest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 from io import StringIO
 
 from google.ads.googleads.errors import GoogleAdsException
 from google.ads.googleads.client import GoogleAdsClient
 
+from api_examples.tests._helpers import canned_google_ads_exception
+
 # Import the main function from the script
+from api_examples import capture_gclids
 from api_examples.capture_gclids import main
 
 
-class TestCaptureGCLIDs(unittest.TestCase):
-    def setUp(self):
-        self.mock_client = MagicMock(spec=GoogleAdsClient)
-        self.mock_conversion_upload_service = MagicMock()
-        self.mock_conversion_action_service = MagicMock()
+def _conversion_action_row(resource_name):
+    """Builds a plain stand-in for a conversion action GoogleAdsRow."""
+    return SimpleNamespace(conversion_action=SimpleNamespace(resource_name=resource_name))
 
-        self.mock_client.get_service.side_effect = [
-            self.mock_conversion_upload_service,  # First call to get_service
-            self.mock_conversion_action_service,  # Second call to get_service
-        ]
 
-        self.mock_click_conversion = MagicMock()
-        self.mock_upload_click_conversions_request = MagicMock()
-        self.mock_client.get_type.side_effect = [
-            self.mock_click_conversion,  # For ClickConversion
-            self.mock_upload_click_conversions_request,  # For UploadClickConversionsRequest
-        ]
+class TestCaptureGCLIDs(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Specing against the class makes every MagicMock walk and inspect
+        # all of GoogleAdsClient's attributes; the names are gathered once
+        # here and each test's mock is specced against the list instead.
+        cls._client_spec = dir(GoogleAdsClient)
+        # The service mocks are built once and reset between tests.
+        cls._SERVICES = {
+            "ConversionUploadService": MagicMock(),
+            "ConversionActionService": MagicMock(),
+            "GoogleAdsService": MagicMock(),
+        }
+        # ClickConversion is only used for its type, which builds each
+        # conversion from keyword arguments, so one plain object is shared.
+        cls._click_conversion = SimpleNamespace()
+
+    def setUp(self):
+        self.mock_client = MagicMock(spec=self._client_spec)
+        for service in self._SERVICES.values():
+            service.reset_mock(return_value=True, side_effect=True)
+        self.mock_conversion_upload_service = self._SERVICES["ConversionUploadService"]
+        self.mock_conversion_action_service = self._SERVICES["ConversionActionService"]
+        self.mock_ga_service = self._SERVICES["GoogleAdsService"]
+        self.mock_client.get_service.side_effect = self._SERVICES.__getitem__
+
+        # The request is a bag of attributes filled in by the script, so a
+        # fresh one is handed out per test.
+        self.mock_click_conversion = self._click_conversion
+        self.mock_upload_click_conversions_request = SimpleNamespace(conversions=[])
+        self.mock_client.get_type.side_effect = {
+            "ClickConversion": self.mock_click_conversion,
+            "UploadClickConversionsRequest": self.mock_upload_click_conversions_request,
+        }.__getitem__
 
         self.customer_id = "1234567890"
         self.gclid = "test_gclid_123"
         self.conversion_date_time = "2026-02-16 12:32:45-08:00"
-        self.captured_output = StringIO()
-        sys.stdout = self.captured_output
-
-    def tearDown(self):
-        sys.stdout = sys.__stdout__
+        capture_gclids._conversion_action_cache.clear()
 
     def test_main_successful_upload(self):
-        mock_conversion_action_response = MagicMock()
-        mock_conversion_action_response.resource_name = (
+        mock_conversion_action_response = _conversion_action_row(
             "customers/123/conversionActions/456"
         )
-        self.mock_conversion_action_service.search_conversion_actions.return_value = [
-            mock_conversion_action_response
-        ]
+        self.mock_ga_service.search.return_value = [mock_conversion_action_response]
 
-        mock_upload_response = MagicMock()
-        mock_upload_response.results = [MagicMock(gclid="test_gclid_123")]
+        mock_upload_response = SimpleNamespace(results=[SimpleNamespace(gclid="test_gclid_123")])
         self.mock_conversion_upload_service.upload_click_conversions.return_value = (
             mock_upload_response
         )
 
-        # Make conversions attribute a real list for testing append behavior
-        self.mock_upload_click_conversions_request.conversions = []
-
-        main(self.mock_client, self.customer_id, self.gclid, self.conversion_date_time)
+        buf = StringIO()
+        with redirect_stdout(buf):
+            main(self.mock_client, self.customer_id, [self.gclid], self.conversion_date_time)
 
         # Assert get_service calls
         self.mock_client.get_service.assert_any_call("ConversionUploadService")
-        self.mock_client.get_service.assert_any_call("ConversionActionService")
+        self.mock_client.get_service.assert_any_call("GoogleAdsService")
 
         # Assert get_type calls
         self.mock_client.get_type.assert_any_call("ClickConversion")
         self.mock_client.get_type.assert_any_call("UploadClickConversionsRequest")
 
-        # Assert search_conversion_actions was called
-        self.mock_conversion_action_service.search_conversion_actions.assert_called_once_with(
-            customer_id=self.customer_id
-        )
-
-        # Assert ClickConversion object properties
-        self.assertEqual(self.mock_click_conversion.gclid, self.gclid)
+        # Assert a single conversion action was searched for
+        self.mock_ga_service.search.assert_called_once()
         self.assertEqual(
-            self.mock_click_conversion.conversion_action,
-            mock_conversion_action_response.resource_name,
+            self.mock_ga_service.search.call_args.kwargs["customer_id"],
+            self.customer_id,
         )
-        self.assertEqual(
-            self.mock_click_conversion.conversion_date_time, self.conversion_date_time
-        )
-        self.assertEqual(self.mock_click_conversion.conversion_value, 23.41)
-        self.assertEqual(self.mock_click_conversion.currency_code, "USD")
+        self.assertIn("LIMIT 1", self.mock_ga_service.search.call_args.kwargs["query"])
 
         # Assert UploadClickConversionsRequest object properties
         self.assertEqual(
             self.mock_upload_click_conversions_request.customer_id, self.customer_id
         )
-        self.assertIn(
-            self.mock_click_conversion,
-            self.mock_upload_click_conversions_request.conversions,
+        self.assertEqual(len(self.mock_upload_click_conversions_request.conversions), 1)
+
+        # Assert ClickConversion object properties
+        click_conversion = self.mock_upload_click_conversions_request.conversions[0]
+        self.assertEqual(click_conversion.gclid, self.gclid)
+        self.assertEqual(
+            click_conversion.conversion_action,
+            mock_conversion_action_response.conversion_action.resource_name,
+        )
+        self.assertEqual(
+            click_conversion.conversion_date_time, self.conversion_date_time
         )
+        self.assertEqual(click_conversion.conversion_value, 23.41)
+        self.assertEqual(click_conversion.currency_code, "USD")
         self.assertTrue(self.mock_upload_click_conversions_request.partial_failure)
 
         # Assert upload_click_conversions was called
@@ -117,49 +132,101 @@ class TestCaptureGCLIDs(unittest.TestCase):
         )
 
         # Assert output
-        output = self.captured_output.getvalue()
+        output = buf.getvalue()
         self.assertIn(str(mock_upload_response), output)
 
+    @patch("api_examples.capture_gclids._MAX_CONVERSIONS_PER_REQUEST", 2)
+    def test_main_uploads_in_batches(self):
+        self.mock_ga_service.search.return_value = [
+            _conversion_action_row("customers/123/conversionActions/456")
+        ]
+        requests = []
+
+        def get_type(type_name):
+            if type_name == "UploadClickConversionsRequest":
+                request = SimpleNamespace(conversions=[])
+                requests.append(request)
+                return request
+            return SimpleNamespace()
+
+        self.mock_client.get_type.side_effect = get_type
+        gclids = ["gclid_1", "gclid_2", "gclid_3"]
+
+        main(self.mock_client, self.customer_id, gclids, self.conversion_date_time)
+
+        self.assertEqual(
+            self.mock_conversion_upload_service.upload_click_conversions.call_count, 2
+        )
+        self.assertEqual(
+            [[c.gclid for c in r.conversions] for r in requests],
+            [["gclid_1", "gclid_2"], ["gclid_3"]],
+        )
+        self.mock_ga_service.search.assert_called_once()
+
+    def test_main_accepts_a_single_gclid_string(self):
+        self.mock_ga_service.search.return_value = [
+            _conversion_action_row("customers/123/conversionActions/456")
+        ]
+        requests = []
+
+        def get_type(type_name):
+            if type_name == "UploadClickConversionsRequest":
+                request = SimpleNamespace(conversions=[])
+                requests.append(request)
+                return request
+            return SimpleNamespace()
+
+        self.mock_client.get_type.side_effect = get_type
+
+        main(self.mock_client, self.customer_id, self.gclid, self.conversion_date_time)
+
+        self.assertEqual(
+            [[c.gclid for c in r.conversions] for r in requests], [[self.gclid]]
+        )
+
+    def test_main_with_conversion_action_id(self):
+        self.mock_conversion_action_service.conversion_action_path.return_value = (
+            "customers/1234567890/conversionActions/456"
+        )
+        main(
+            self.mock_client,
+            self.customer_id,
+            [self.gclid],
+            self.conversion_date_time,
+            conversion_action_id="456",
+        )
+
+        self.mock_conversion_action_service.conversion_action_path.assert_called_once_with(
+            self.customer_id, "456"
+        )
+        self.mock_ga_service.search.assert_not_called()
+        self.assertEqual(
+            self.mock_upload_click_conversions_request.conversions[0].conversion_action,
+            "customers/1234567890/conversionActions/456",
+        )
+
     def test_main_no_conversion_actions_found(self):
-        self.mock_conversion_action_service.search_conversion_actions.return_value = []
+        self.mock_ga_service.search.return_value = []
 
-        with self.assertRaises(SystemExit) as cm:
-            main(self.mock_client, self.customer_id, self.gclid, self.conversion_date_time)
+        buf = StringIO()
+        with self.assertRaises(SystemExit) as cm, redirect_stdout(buf):
+            main(self.mock_client, self.customer_id, [self.gclid], self.conversion_date_time)
 
         self.assertEqual(cm.exception.code, 1)
-        output = self.captured_output.getvalue()
+        output = buf.getvalue()
         self.assertIn("No conversion actions found. Please create one.", output)
 
     def test_main_google_ads_exception(self):
-        self.mock_conversion_action_service.search_conversion_actions.return_value = [
-            MagicMock(resource_name="customers/123/conversionActions/456")
-        ]
-
-        mock_error_status = MagicMock()
-        mock_error_status.code = MagicMock()
-        mock_error_status.code.name = "REQUEST_ERROR"
-
-        mock_failure = MagicMock()
-        mock_failure.errors = [
-            MagicMock(
-                message="Error details",
-                location=MagicMock(
-                    field_path_elements=[MagicMock(field_name="test_field")]
-                ),
-            )
+        self.mock_ga_service.search.return_value = [
+            _conversion_action_row("customers/123/conversionActions/456")
         ]
 
         self.mock_conversion_upload_service.upload_click_conversions.side_effect = (
-            GoogleAdsException(
-                mock_error_status,  # Positional argument for error
-                failure=mock_failure,
-                request_id="test_request_id",
-                call=MagicMock(),
-            )
+            canned_google_ads_exception()
         )
 
         with self.assertRaises(GoogleAdsException) as cm:
-            main(self.mock_client, self.customer_id, self.gclid, self.conversion_date_time)
+            main(self.mock_client, self.customer_id, [self.gclid], self.conversion_date_time)
 
         # The exception object is now directly the GoogleAdsException
         ex = cm.exception
@@ -13,13 +13,10 @@
 # limitations under the License.
 
 import sys
-import os
 import unittest
 from unittest.mock import MagicMock, patch, mock_open
 from io import StringIO
 
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
-
 from google.ads.googleads.errors import GoogleAdsException
 from google.ads.googleads.client import GoogleAdsClient
 from api_examples.collect_conversions_troubleshooting_data import main
@@ -77,7 +74,7 @@ class TestCollectConversionsTroubleshootingData(unittest.TestCase):
 
         main(self.mock_client, self.customer_id)
 
-        handle = mock_file_open()
+        handle = mock_file_open.return_value
         written_content = "".join(call.args[0] for call in handle.write.call_args_list)
         
         self.assertIn("Diagnostic Report for Customer ID: 1234567890", written_content)
@@ -106,7 +103,7 @@ class TestCollectConversionsTroubleshootingData(unittest.TestCase):
 
         main(self.mock_client, self.customer_id)
 
-        handle = mock_file_open()
+        handle = mock_file_open.return_value
         written_content = "".join(call.args[0] for call in handle.write.call_args_list)
         
         self.assertIn("CRITICAL: Customer Data Terms NOT accepted.", written_content)
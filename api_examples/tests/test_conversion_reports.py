@@ -13,16 +13,29 @@
 # limitations under the License.
 
 # Copyright 2026 Google LLC
-import sys
+import argparse
+import contextlib
 import os
+import tempfile
 import unittest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, mock_open, patch
 from io import StringIO
 from datetime import datetime, timedelta
+from types import SimpleNamespace
 
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from api_examples.conversion_reports import (
+    _build_gaql,
+    _calculate_date_range,
+    _filter_argument,
+    handle_googleads_exception,
+    _interning,
+    get_conversion_actions_report,
+    get_conversion_performance_report,
+)
+
+# Substrings the console report for the mapping test must contain.
+_CONSOLE_NEEDLES = ("Console output is limited to 1000 rows.", "Opti Campaign", "10.5")
 
-from api_examples.conversion_reports import _calculate_date_range, get_conversion_performance_report
 
 class TestConversionReports(unittest.TestCase):
     def setUp(self):
@@ -30,11 +43,6 @@ class TestConversionReports(unittest.TestCase):
         self.mock_ga_service = MagicMock()
         self.mock_client.get_service.return_value = self.mock_ga_service
         self.customer_id = "1234567890"
-        self.captured_output = StringIO()
-        sys.stdout = self.captured_output
-
-    def tearDown(self):
-        sys.stdout = sys.__stdout__
 
     def test_calculate_date_range_preset_last_10_days(self):
         start, end = _calculate_date_range(None, None, "LAST_10_DAYS")
@@ -43,25 +51,210 @@ class TestConversionReports(unittest.TestCase):
         self.assertEqual(start, expected_start)
         self.assertEqual(end, today.strftime("%Y-%m-%d"))
 
+    def test_calculate_date_range_custom_dates(self):
+        self.assertEqual(
+            _calculate_date_range("2026-01-01", "2026-01-31", None),
+            ("2026-01-01", "2026-01-31"),
+        )
+
+    def test_calculate_date_range_invalid_custom_dates_fall_back(self):
+        start, end = _calculate_date_range("2026-13-01", "2026-01-31", None)
+        today = datetime.now()
+        self.assertEqual(start, (today - timedelta(days=30)).strftime("%Y-%m-%d"))
+        self.assertEqual(end, today.strftime("%Y-%m-%d"))
+
     def test_get_conversion_performance_report_mapping(self):
-        mock_row = MagicMock()
-        mock_row.segments.date = "2026-02-24"
-        mock_row.campaign.id = 999
-        mock_row.campaign.name = "Opti Campaign"
-        mock_row.metrics.conversions = 10.5
-
-        mock_batch = MagicMock()
-        mock_batch.results = [mock_row]
-        self.mock_ga_service.search_stream.return_value = [mock_batch]
-
-        get_conversion_performance_report(
-            self.mock_client, self.customer_id, "console", "", None, None, "LAST_7_DAYS",
-            ["conversions"], [], None
+        mock_row = SimpleNamespace(
+            segments=SimpleNamespace(date="2026-02-24"),
+            campaign=SimpleNamespace(id=999, name="Opti Campaign"),
+            metrics=SimpleNamespace(conversions=10.5),
+        )
+        self.mock_ga_service.search_stream.return_value = [SimpleNamespace(results=[mock_row])]
+
+        with contextlib.redirect_stdout(StringIO()) as buf:
+            get_conversion_performance_report(
+                self.mock_client, self.customer_id, "console", "", None, None, "LAST_7_DAYS",
+                ["conversions"], [], None
+            )
+
+        self.assertIn(
+            "LIMIT 1000", self.mock_ga_service.search_stream.call_args.kwargs["query"]
+        )
+        output = buf.getvalue()
+        self.assertEqual([n for n in _CONSOLE_NEEDLES if n not in output], [])
+        self.assertTrue(
+            output.endswith(
+                "Date       | Campaign ID | Campaign      | Conversions\n"
+                + "-" * 54
+                + "\n"
+                + "2026-02-24 | 999         | Opti Campaign | 10.5       \n"
+            )
+        )
+
+    def test_build_gaql_is_cached(self):
+        args = (("conversions",), ("campaign.status",), 10)
+
+        template, fields = _build_gaql(*args)
+
+        self.assertIs(_build_gaql(*args)[0], template)
+        fragments = (
+            "FROM campaign",
+            "BETWEEN '{start}' AND '{end}'",
+            "AND campaign.status = '{filter_0}'",
+            "LIMIT 10",
+        )
+        self.assertEqual([f for f in fragments if f not in template], [])
+        self.assertEqual(
+            fields, ("segments.date", "campaign.id", "campaign.name", "metrics.conversions")
+        )
+
+    def test_get_conversion_performance_report_metric_order_is_stable(self):
+        self.mock_ga_service.search_stream.return_value = []
+        queries = []
+        for metrics in (["clicks", "conversions"], ["conversions", "clicks", "clicks"]):
+            get_conversion_performance_report(
+                self.mock_client, self.customer_id, "csv", "out.csv", "2026-01-01",
+                "2026-01-31", None, metrics, [], None
+            )
+            queries.append(self.mock_ga_service.search_stream.call_args.kwargs["query"])
+
+        self.assertEqual(queries[0], queries[1])
+        self.assertIn(
+            "SELECT segments.date, campaign.id, campaign.name, metrics.conversions, "
+            "metrics.clicks FROM campaign",
+            queries[0],
+        )
+
+    def test_get_conversion_performance_report_filters(self):
+        cases = (
+            (
+                ["segments.conversion_action_name = Bob's=Signup"],
+                (
+                    "FROM customer",
+                    "BETWEEN '2026-01-01' AND '2026-01-31'",
+                    "AND segments.conversion_action_name = 'Bob\\'s=Signup'",
+                ),
+            ),
+            (["min_conversions=5"], ("FROM campaign", "AND metrics.conversions > 5.0")),
         )
+        self.mock_ga_service.search_stream.return_value = []
+        for filters, fragments in cases:
+            with self.subTest(filters=filters):
+                get_conversion_performance_report(
+                    self.mock_client, self.customer_id, "csv", "out.csv", "2026-01-01",
+                    "2026-01-31", None, ["conversions"], filters, None
+                )
 
-        output = self.captured_output.getvalue()
-        self.assertIn("Opti Campaign", output)
-        self.assertIn("10.5", output)
+                query = self.mock_ga_service.search_stream.call_args.kwargs["query"]
+                self.assertEqual([f for f in fragments if f not in query], [])
+
+    def test_filter_argument_rejects_non_numeric_min_conversions(self):
+        for arg in ("min_conversions=5", "segments.conversion_action_name=abc"):
+            self.assertEqual(_filter_argument(arg), arg)
+        for arg in ("min_conversions=abc", "min_conversions=nan"):
+            with self.subTest(arg=arg), self.assertRaises(argparse.ArgumentTypeError):
+                _filter_argument(arg)
+
+    def test_interning_shares_repeated_values(self):
+        extract_row = _interning(lambda row: row, [0])
+
+        first = extract_row(("".join(["2026-", "02-24"]), 1))
+        second = extract_row(("".join(["2026-02", "-24"]), 2))
+
+        self.assertIs(first[0], second[0])
+        self.assertEqual(second[1], 2)
+
+    def test_get_conversion_actions_report_streams_csv(self):
+        ca = SimpleNamespace(
+            id=42,
+            name="Purchase",
+            status=SimpleNamespace(name="ENABLED"),
+            type=SimpleNamespace(name="WEBPAGE"),
+            category=SimpleNamespace(name="PURCHASE"),
+            owner_customer="customers/1234567890",
+            include_in_conversions_metric=True,
+            click_through_lookback_window_days=30,
+            view_through_lookback_window_days=1,
+            attribution_model_settings=SimpleNamespace(
+                attribution_model=SimpleNamespace(name="GOOGLE_ADS_LAST_CLICK"),
+                data_driven_model_status=SimpleNamespace(name="UNSPECIFIED"),
+            ),
+        )
+        mock_row = SimpleNamespace(conversion_action=ca)
+        self.mock_ga_service.search_stream.return_value = [SimpleNamespace(results=[mock_row])]
+
+        with patch("builtins.open", new_callable=mock_open) as mock_file_open, \
+                patch("api_examples.conversion_reports.os.replace") as mock_replace, \
+                contextlib.redirect_stdout(StringIO()) as buf:
+            get_conversion_actions_report(self.mock_client, self.customer_id, "out.csv")
+
+        mock_file_open.assert_called_once_with(
+            "out.csv.part", "w", newline="", encoding="utf-8", buffering=1 << 22
+        )
+        mock_replace.assert_called_once_with("out.csv.part", "out.csv")
+
+        handle = mock_file_open.return_value
+        written = "".join(c.args[0] for c in handle.write.call_args_list)
+        self.assertIn(
+            "ID,Name,Status,Type,Category,Owner,Include In Conversions,"
+            "Click-Through Window Days,View-Through Window Days,Attribution,"
+            "Data-Driven Model Status\r\n",
+            written,
+        )
+        self.assertIn(
+            "42,Purchase,ENABLED,WEBPAGE,PURCHASE,customers/1234567890,True,30,1,"
+            "GOOGLE_ADS_LAST_CLICK,UNSPECIFIED\r\n",
+            written,
+        )
+        self.assertIn("Results written to out.csv", buf.getvalue())
+
+    def test_get_conversion_actions_report_interrupted_keeps_previous_file(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output_file = os.path.join(tmp_dir, "saved_csv", "actions.csv")
+            os.makedirs(os.path.dirname(output_file))
+            with open(output_file, "w") as f:
+                f.write("previous")
+
+            mock_stream = MagicMock()
+            mock_stream.__iter__.side_effect = RuntimeError("stream reset")
+            self.mock_ga_service.search_stream.return_value = mock_stream
+            with self.assertRaises(RuntimeError):
+                get_conversion_actions_report(self.mock_client, self.customer_id, output_file)
+
+            with open(output_file) as f:
+                self.assertEqual(f.read(), "previous")
+            self.assertEqual(os.listdir(os.path.dirname(output_file)), ["actions.csv"])
+
+    def test_get_conversion_actions_report_creates_output_directory(self):
+        self.mock_ga_service.search_stream.return_value = []
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output_file = os.path.join(tmp_dir, "saved_csv", "actions.csv")
+            get_conversion_actions_report(self.mock_client, self.customer_id, output_file)
+            self.assertTrue(os.path.exists(output_file))
+            self.assertFalse(os.path.exists(output_file + ".part"))
+
+    def test_handle_googleads_exception_writes_once_to_stderr(self):
+        error = MagicMock(message="Bad field")
+        error.location.field_path_elements = [
+            MagicMock(field_name="operations"),
+            MagicMock(field_name="name"),
+        ]
+        exception = MagicMock(request_id="req-1")
+        exception.error.code.return_value.name = "INVALID_ARGUMENT"
+        exception.failure.errors = [error]
+
+        with patch("sys.stderr", new_callable=StringIO) as mock_stderr, \
+                self.assertRaises(SystemExit):
+            handle_googleads_exception(exception)
+
+        self.assertEqual(
+            mock_stderr.getvalue(),
+            'Request with ID "req-1" failed with status "INVALID_ARGUMENT" and '
+            "includes the following errors:\n"
+            '\tError with message "Bad field".\n'
+            "\t\tOn field: operations\n"
+            "\t\tOn field: name\n",
+        )
 
 if __name__ == "__main__":
     unittest.main()
@@ -13,16 +13,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import sys
-import os
-
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
-
 import unittest
 from unittest.mock import MagicMock, patch
 
-from google.ads.googleads.client import GoogleAdsClient
-
 from api_examples.create_campaign_experiment import (
     create_experiment_resource,
     create_experiment_arms,
@@ -41,7 +34,9 @@ class MockMutateExperimentArmsRequest:
 
 class TestCreateCampaignExperiment(unittest.TestCase):
     def setUp(self):
-        self.mock_client = MagicMock(spec=GoogleAdsClient)
+        # Only get_service, get_type and enums are touched, so the client
+        # mock is left unspecced.
+        self.mock_client = MagicMock()
         self.mock_experiment_service = MagicMock()
         self.mock_campaign_service = MagicMock()
         self.mock_experiment_arm_service = MagicMock()
@@ -55,33 +50,39 @@ class TestCreateCampaignExperiment(unittest.TestCase):
         self.customer_id = "1234567890"
         self.base_campaign_id = "111222333"
 
+        patcher = patch("api_examples.create_campaign_experiment.uuid")
+        self.mock_uuid = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mock_uuid.uuid4.return_value = "test-uuid"
+
     def test_create_experiment_resource(self):
-        mock_uuid = MagicMock()
-        mock_uuid.uuid4.return_value = "test-uuid"
-        with patch("api_examples.create_campaign_experiment.uuid", mock_uuid):
-            mock_experiment_service = MagicMock()
-            self.mock_client.get_service.return_value = mock_experiment_service
-
-            mock_experiment_operation = MagicMock()
-            mock_experiment = MagicMock()
-            mock_experiment_operation.create = mock_experiment
-            self.mock_client.get_type.return_value = mock_experiment_operation
-
-            expected_resource_name = "customers/1234567890/experiments/98765"
-            mock_response = MagicMock()
-            mock_response.results = [MagicMock(resource_name=expected_resource_name)]
-            mock_experiment_service.mutate_experiments.return_value = mock_response
-
-            resource_name = create_experiment_resource(
-                self.mock_client, self.customer_id
-            )
-
-            self.mock_client.get_service.assert_called_once_with("ExperimentService")
-            self.mock_client.get_type.assert_called_once_with("ExperimentOperation")
-            mock_experiment_service.mutate_experiments.assert_called_once_with(
-                customer_id=self.customer_id, operations=[mock_experiment_operation]
-            )
-            self.assertEqual(resource_name, expected_resource_name)
+        mock_experiment_service = MagicMock()
+        self.mock_client.get_service.return_value = mock_experiment_service
+
+        mock_experiment_operation = MagicMock()
+        mock_experiment = MagicMock()
+        mock_experiment_operation.create = mock_experiment
+        self.mock_client.get_type.return_value = mock_experiment_operation
+
+        expected_resource_name = "customers/1234567890/experiments/98765"
+        mock_response = MagicMock()
+        mock_response.results = [MagicMock(resource_name=expected_resource_name)]
+        mock_experiment_service.mutate_experiments.return_value = mock_response
+
+        resource_name = create_experiment_resource(
+            self.mock_client, self.customer_id
+        )
+
+        self.mock_client.get_service.assert_called_once_with("ExperimentService")
+        self.mock_client.get_type.assert_called_once_with("ExperimentOperation")
+        mock_experiment_service.mutate_experiments.assert_called_once()
+        call_kwargs = mock_experiment_service.mutate_experiments.call_args.kwargs
+        self.assertEqual(call_kwargs["customer_id"], self.customer_id)
+        (operation,) = call_kwargs["operations"]
+        self.assertEqual(
+            operation.create.name, "Campaign Version Test Experiment #test-uuid"
+        )
+        self.assertEqual(resource_name, expected_resource_name)
 
     def test_create_experiment_arms(self):
         mock_campaign_service = MagicMock()
@@ -98,9 +99,10 @@ class TestCreateCampaignExperiment(unittest.TestCase):
 
         mock_mutate_experiment_arms_request = MockMutateExperimentArmsRequest()
 
+        # Message classes are resolved once, so ExperimentArmOperation is
+        # looked up a single time for both arms.
         self.mock_client.get_type.side_effect = [
-            mock_experiment_arm_operation,  # For control arm
-            mock_experiment_arm_operation,  # For treatment arm
+            mock_experiment_arm_operation,  # For ExperimentArmOperation
             mock_mutate_experiment_arms_request,  # For MutateExperimentArmsRequest
         ]
 
@@ -139,7 +141,7 @@ class TestCreateCampaignExperiment(unittest.TestCase):
         self.mock_client.get_service.assert_any_call("CampaignService")
         self.mock_client.get_service.assert_any_call("ExperimentArmService")
 
-        self.assertEqual(self.mock_client.get_type.call_count, 3)
+        self.assertEqual(self.mock_client.get_type.call_count, 2)
         mock_campaign_service.campaign_path.assert_called_once_with(
             self.customer_id, self.base_campaign_id
         )
@@ -148,11 +150,7 @@ class TestCreateCampaignExperiment(unittest.TestCase):
             draft_campaign_resource_name, expected_draft_campaign_resource_name
         )
 
-    @patch("api_examples.create_campaign_experiment.uuid")
-    @patch("api_examples.create_campaign_experiment.protobuf_helpers.field_mask")
-    def test_modify_treatment_campaign(self, mock_field_mask, mock_uuid):
-        mock_uuid.uuid4.return_value = "test-uuid"
-
+    def test_modify_treatment_campaign(self):
         mock_campaign_service = MagicMock()
         self.mock_client.get_service.return_value = mock_campaign_service
 
@@ -166,15 +164,18 @@ class TestCreateCampaignExperiment(unittest.TestCase):
         mock_mutate_response = MagicMock()
         mock_campaign_service.mutate_campaigns.return_value = mock_mutate_response
 
-        mock_field_mask.return_value = "field_mask_value"
-
         modify_treatment_campaign(
             self.mock_client, self.customer_id, draft_campaign_resource_name
         )
 
         self.mock_client.get_service.assert_called_once_with("CampaignService")
         self.mock_client.get_type.assert_called_once_with("CampaignOperation")
-        mock_campaign_service.mutate_campaigns.assert_called_once_with(
-            customer_id=self.customer_id, operations=[mock_campaign_operation]
+        mock_campaign_service.mutate_campaigns.assert_called_once()
+        call_kwargs = mock_campaign_service.mutate_campaigns.call_args.kwargs
+        self.assertEqual(call_kwargs["customer_id"], self.customer_id)
+        (operation,) = call_kwargs["operations"]
+        self.assertEqual(operation.update.resource_name, draft_campaign_resource_name)
+        operation.update_mask.paths.extend.assert_called_once_with(
+            ["name", "budget.amount_micros"]
         )
-        self.mock_client.copy_from.assert_called_once()
+        self.mock_client.copy_from.assert_not_called()
@@ -12,74 +12,160 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import sys
-import os
-
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+import contextlib
+from contextlib import redirect_stdout
+from types import SimpleNamespace
 
 import unittest
 from unittest.mock import MagicMock, patch, mock_open
 from io import StringIO
 
-from google.ads.googleads.errors import GoogleAdsException
-from google.ads.googleads.client import GoogleAdsClient
+from api_examples.tests._helpers import canned_google_ads_exception
 
 # Import functions from the script
 from api_examples.disapproved_ads_reports import main
 
 
+@contextlib.contextmanager
+def _capture_open():
+    """Patches open to return one in-memory buffer whose contents outlive close()."""
+    buf = StringIO()
+    buf.close = lambda: None
+    with patch("builtins.open", return_value=buf) as mock_file_open:
+        yield buf, mock_file_open
+
+
+def _policy_entry(topic, type_name, *evidence_texts):
+    """Builds a plain stand-in for a PolicyTopicEntry."""
+    return SimpleNamespace(
+        topic=topic,
+        type_=SimpleNamespace(name=type_name),
+        evidences=[SimpleNamespace(text_list=SimpleNamespace(texts=t)) for t in evidence_texts],
+    )
+
+
+def _ad_row(ad_id, entries, campaign_id=123, campaign_name="Test Campaign"):
+    """Builds a plain stand-in for a disapproved ad GoogleAdsRow."""
+    return SimpleNamespace(
+        campaign=SimpleNamespace(id=campaign_id, name=campaign_name),
+        ad_group_ad=SimpleNamespace(
+            ad=SimpleNamespace(id=ad_id),
+            policy_summary=SimpleNamespace(policy_topic_entries=entries),
+        ),
+    )
+
+
+def _campaign_row(campaign_id):
+    """Builds a plain stand-in for a campaign ID GoogleAdsRow."""
+    return SimpleNamespace(campaign=SimpleNamespace(id=campaign_id))
+
+
+# Read-only payloads, built once at import and shared by the tests.
+_DISAPPROVED_ROW = _ad_row(
+    456, [_policy_entry("Adult Content", "PROHIBITED", ["casino", "poker"], ["slots"])]
+)
+_CAMPAIGN_STREAM = [SimpleNamespace(results=[_campaign_row(123)])]
+
+
 class TestDisapprovedAdsReports(unittest.TestCase):
     def setUp(self):
-        self.mock_client = MagicMock(spec=GoogleAdsClient)
+        self.mock_client = MagicMock()
         self.mock_ga_service = MagicMock()
         self.mock_client.get_service.return_value = self.mock_ga_service
         self.customer_id = "1234567890"
-        self.captured_output = StringIO()
-        sys.stdout = self.captured_output
-
-    def tearDown(self):
-        sys.stdout = sys.__stdout__
 
     def test_main_success(self):
-        mock_row = MagicMock()
-        mock_row.campaign.id = 123
-        mock_row.campaign.name = "Test Campaign"
-        mock_row.ad_group_ad.ad.id = 456
-        mock_row.ad_group_ad.policy_summary.approval_status.name = "DISAPPROVED"
-        
-        mock_entry = MagicMock()
-        mock_entry.topic = "Adult Content"
-        mock_entry.type_.name = "PROHIBITED"
-        mock_row.ad_group_ad.policy_summary.policy_topic_entries = [mock_entry]
-
-        mock_batch = MagicMock()
-        mock_batch.results = [mock_row]
-
-        self.mock_ga_service.search_stream.return_value = [mock_batch]
+        def search_stream(customer_id, query):
+            if "FROM campaign" in query:
+                return _CAMPAIGN_STREAM
+            return [SimpleNamespace(results=[_DISAPPROVED_ROW])]
+
+        self.mock_ga_service.search_stream.side_effect = search_stream
 
         output_file = "test_disapproved.csv"
-        with patch("builtins.open", new_callable=mock_open) as mock_file_open:
+        output = StringIO()
+        with _capture_open() as (buf, mock_file_open), redirect_stdout(output):
             main(self.mock_client, self.customer_id, output_file)
 
-            self.mock_ga_service.search_stream.assert_called_once()
-            handle = mock_file_open()
-            handle.write.assert_any_call("Campaign ID,Campaign,Ad ID,Status,Topics\r\n")
-            handle.write.assert_any_call("123,Test Campaign,456,DISAPPROVED,Adult Content\r\n")
-            self.assertIn(f"Disapproved ads report written to {output_file}", self.captured_output.getvalue())
+        self.assertEqual(self.mock_ga_service.search_stream.call_count, 2)
+        shard_query = self.mock_ga_service.search_stream.call_args.kwargs["query"]
+        fragments = (
+            "FROM ad_group_ad",
+            "ad_group_ad.policy_summary.policy_topic_entries",
+            "WHERE campaign.id IN (123)",
+        )
+        self.assertEqual([f for f in fragments if f not in shard_query], [])
+        mock_file_open.assert_called_once_with(
+            output_file, "w", newline="", encoding="utf-8", buffering=1 << 18
+        )
+        self.assertEqual(
+            buf.getvalue(),
+            "Campaign ID,Campaign,Ad ID,Status,Topics\r\n"
+            "123,Test Campaign,456,DISAPPROVED,Adult Content\r\n",
+        )
+        self.assertIn(f"Disapproved ads report written to {output_file}", output.getvalue())
+
+    def test_main_filters_policy_entries(self):
+        rows = [
+            _ad_row(1, []),
+            _ad_row(2, [_policy_entry("Trademarks", "LIMITED", ["brand"])]),
+            _ad_row(3, [
+                _policy_entry("Gambling", "PROHIBITED", ["casino"]),
+                _policy_entry("Trademarks", "LIMITED", ["brand"]),
+                _policy_entry("Alcohol", "PROHIBITED", ["beer", "wine"]),
+            ]),
+            _ad_row(4, [
+                _policy_entry("Trademarks", "LIMITED", ["brand"]),
+                _policy_entry("Destination", "LIMITED", ["url"]),
+            ]),
+        ]
+
+        def search_stream(customer_id, query):
+            if "FROM campaign" in query:
+                return _CAMPAIGN_STREAM
+            return [SimpleNamespace(results=rows)]
+
+        self.mock_ga_service.search_stream.side_effect = search_stream
+
+        with _capture_open() as (buf, _):
+            main(self.mock_client, self.customer_id, "test.csv")
+
+        self.assertEqual(
+            buf.getvalue(),
+            "Campaign ID,Campaign,Ad ID,Status,Topics\r\n"
+            "123,Test Campaign,3,DISAPPROVED,Gambling; Alcohol\r\n",
+        )
+
+    def test_main_chunks_campaign_ids_across_queries(self):
+        campaign_rows = [_campaign_row(campaign_id) for campaign_id in range(1, 21)]
+        shard_queries = []
+
+        def search_stream(customer_id, query):
+            if "FROM campaign" in query:
+                return [SimpleNamespace(results=campaign_rows)]
+            shard_queries.append(query)
+            return []
+
+        self.mock_ga_service.search_stream.side_effect = search_stream
+
+        with patch("builtins.open", new_callable=mock_open), \
+                patch("api_examples.disapproved_ads_reports._CAMPAIGN_IDS_PER_QUERY", 6):
+            main(self.mock_client, self.customer_id, "test.csv")
+
+        shard_ids = [
+            [int(campaign_id) for campaign_id in query.split("IN (")[1].rstrip(")").split(", ")]
+            for query in shard_queries
+        ]
+        self.assertEqual(sorted(len(ids) for ids in shard_ids), [2, 6, 6, 6])
+        self.assertEqual(sorted(sum(shard_ids, [])), list(range(1, 21)))
 
     def test_main_google_ads_exception(self):
-        mock_error = MagicMock()
-        mock_error.code.return_value.name = "REQUEST_ERROR"
-        
-        self.mock_ga_service.search_stream.side_effect = GoogleAdsException(
-            error=mock_error,
-            failure=MagicMock(errors=[MagicMock(message="Error details")]),
-            request_id="test_request_id",
-            call=MagicMock(),
-        )
+        self.mock_ga_service.search_stream.side_effect = canned_google_ads_exception()
 
-        main(self.mock_client, self.customer_id, "test.csv")
-        self.assertIn("Request ID test_request_id failed: REQUEST_ERROR", self.captured_output.getvalue())
+        buf = StringIO()
+        with redirect_stdout(buf):
+            main(self.mock_client, self.customer_id, "test.csv")
+        self.assertIn("Request ID test_request_id failed: REQUEST_ERROR", buf.getvalue())
 
 
 if __name__ == "__main__":
@@ -14,13 +14,10 @@
 
 # Copyright 2026 Google LLC
 import sys
-import os
 import unittest
 from unittest.mock import MagicMock, patch
 from io import StringIO
 
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
-
 from api_examples.gaql_validator import main
 
 class TestGAQLValidator(unittest.TestCase):
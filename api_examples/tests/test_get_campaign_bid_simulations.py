@@ -12,67 +12,61 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import sys
-import os
-
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from contextlib import redirect_stdout
+from types import SimpleNamespace
 
 import unittest
 from unittest.mock import MagicMock
 from io import StringIO
 
-from google.ads.googleads.errors import GoogleAdsException
-from google.ads.googleads.client import GoogleAdsClient
+from api_examples.tests._helpers import canned_google_ads_exception
 
 # Import the main function from the script
 from api_examples.get_campaign_bid_simulations import main
 
 
+# A read-only stream, built once at import and shared by the tests.
+_SIMULATION_STREAM = [
+    SimpleNamespace(
+        results=[
+            SimpleNamespace(
+                campaign_bid_simulation=SimpleNamespace(
+                    bid_modifier=1.0, clicks=100, cost_micros=1000000
+                )
+            )
+        ]
+    )
+]
+
+
 class TestGetCampaignBidSimulations(unittest.TestCase):
     def setUp(self):
-        self.mock_client = MagicMock(spec=GoogleAdsClient)
+        self.mock_client = MagicMock()
         self.mock_ga_service = MagicMock()
         self.mock_client.get_service.return_value = self.mock_ga_service
         self.customer_id = "1234567890"
         self.campaign_id = "111222333"
-        self.captured_output = StringIO()
-        sys.stdout = self.captured_output
-
-    def tearDown(self):
-        sys.stdout = sys.__stdout__
 
     def test_main_successful_call(self):
-        mock_row = MagicMock()
-        mock_row.campaign_bid_simulation.bid_modifier = 1.0
-        mock_row.campaign_bid_simulation.clicks = 100
-        mock_row.campaign_bid_simulation.cost_micros = 1000000
-
-        mock_batch = MagicMock()
-        mock_batch.results = [mock_row]
-
-        self.mock_ga_service.search_stream.return_value = [mock_batch]
+        self.mock_ga_service.search_stream.return_value = _SIMULATION_STREAM
 
-        main(self.mock_client, self.customer_id, self.campaign_id)
+        buf = StringIO()
+        with redirect_stdout(buf):
+            main(self.mock_client, self.customer_id, self.campaign_id)
 
         self.mock_ga_service.search_stream.assert_called_once()
-        output = self.captured_output.getvalue()
+        output = buf.getvalue()
         self.assertIn("1.00", output)
         self.assertIn("100", output)
         self.assertIn("1000000", output)
 
     def test_main_google_ads_exception(self):
-        mock_error = MagicMock()
-        mock_error.code.return_value.name = "REQUEST_ERROR"
-        
-        self.mock_ga_service.search_stream.side_effect = GoogleAdsException(
-            error=mock_error,
-            failure=MagicMock(errors=[MagicMock(message="Error details")]),
-            request_id="test_request_id",
-            call=MagicMock(),
-        )
+        self.mock_ga_service.search_stream.side_effect = canned_google_ads_exception()
 
-        main(self.mock_client, self.customer_id, self.campaign_id)
-        self.assertIn("Request ID test_request_id failed: REQUEST_ERROR", self.captured_output.getvalue())
+        buf = StringIO()
+        with redirect_stdout(buf):
+            main(self.mock_client, self.customer_id, self.campaign_id)
+        self.assertIn("Request ID test_request_id failed: REQUEST_ERROR", buf.getvalue())
 
 
 if __name__ == "__main__":
@@ -12,66 +12,64 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import sys
-import os
-
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from contextlib import redirect_stdout
+from types import SimpleNamespace
 
 import unittest
 from unittest.mock import MagicMock
 from io import StringIO
 
-from google.ads.googleads.errors import GoogleAdsException
-from google.ads.googleads.client import GoogleAdsClient
+from api_examples.tests._helpers import canned_google_ads_exception
 
 # Import functions from the script
 from api_examples.get_campaign_shared_sets import main
 
 
+# A read-only stream, built once at import and shared by the tests.
+_SHARED_SET_STREAM = [
+    SimpleNamespace(
+        results=[
+            SimpleNamespace(
+                campaign=SimpleNamespace(name="Test Campaign"),
+                shared_set=SimpleNamespace(
+                    name="Test Shared Set", type=SimpleNamespace(name="KEYWORD_NEGATIVE")
+                ),
+            )
+        ]
+    )
+]
+
+
 class TestGetCampaignSharedSets(unittest.TestCase):
     def setUp(self):
-        self.mock_client = MagicMock(spec=GoogleAdsClient)
+        self.mock_client = MagicMock()
         self.mock_ga_service = MagicMock()
         self.mock_client.get_service.return_value = self.mock_ga_service
         self.customer_id = "1234567890"
-        self.captured_output = StringIO()
-        sys.stdout = self.captured_output
-
-    def tearDown(self):
-        sys.stdout = sys.__stdout__
 
     def test_main_success(self):
-        mock_row = MagicMock()
-        mock_row.campaign.name = "Test Campaign"
-        mock_row.shared_set.name = "Test Shared Set"
-        mock_row.shared_set.type.name = "KEYWORD_NEGATIVE"
-
-        mock_batch = MagicMock()
-        mock_batch.results = [mock_row]
-
-        self.mock_ga_service.search_stream.return_value = [mock_batch]
+        self.mock_ga_service.search_stream.return_value = _SHARED_SET_STREAM
 
-        main(self.mock_client, self.customer_id)
+        buf = StringIO()
+        with redirect_stdout(buf):
+            main(self.mock_client, self.customer_id)
 
         self.mock_ga_service.search_stream.assert_called_once()
-        output = self.captured_output.getvalue()
+        # split/join strips all whitespace in one pass, without a regex.
+        query = "".join(self.mock_ga_service.search_stream.call_args.kwargs["query"].split())
+        self.assertIn("FROMcampaign_shared_set", query)
+        output = buf.getvalue()
         self.assertIn("Test Campaign", output)
         self.assertIn("Test Shared Set", output)
         self.assertIn("KEYWORD_NEGATIVE", output)
 
     def test_main_google_ads_exception(self):
-        mock_error = MagicMock()
-        mock_error.code.return_value.name = "REQUEST_ERROR"
-        
-        self.mock_ga_service.search_stream.side_effect = GoogleAdsException(
-            error=mock_error,
-            failure=MagicMock(errors=[MagicMock(message="Error details")]),
-            request_id="test_request_id",
-            call=MagicMock(),
-        )
+        self.mock_ga_service.search_stream.side_effect = canned_google_ads_exception()
 
-        main(self.mock_client, self.customer_id)
-        self.assertIn("Request ID test_request_id failed: REQUEST_ERROR", self.captured_output.getvalue())
+        buf = StringIO()
+        with redirect_stdout(buf):
+            main(self.mock_client, self.customer_id)
+        self.assertIn("Request ID test_request_id failed: REQUEST_ERROR", buf.getvalue())
 
 
 if __name__ == "__main__":
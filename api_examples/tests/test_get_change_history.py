@@ -12,67 +12,66 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import sys
-import os
-
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from contextlib import redirect_stdout
+from types import SimpleNamespace
 
 import unittest
 from unittest.mock import MagicMock
 from io import StringIO
 
-from google.ads.googleads.errors import GoogleAdsException
-from google.ads.googleads.client import GoogleAdsClient
+from api_examples.tests._helpers import canned_google_ads_exception
 
 # Import functions from the script
 from api_examples.get_change_history import main
 
 
+# A read-only row, built once at import and shared by the tests.
+_CHANGE_ROW = SimpleNamespace(
+    change_status=SimpleNamespace(
+        resource_name="customers/123/campaigns/456",
+        last_change_date_time="2026-02-24 10:00:00",
+        resource_type=SimpleNamespace(name="CAMPAIGN"),
+        resource_status=SimpleNamespace(name="ADDED"),
+    )
+)
+
+
 class TestGetChangeHistory(unittest.TestCase):
     def setUp(self):
-        self.mock_client = MagicMock(spec=GoogleAdsClient)
+        self.mock_client = MagicMock()
         self.mock_ga_service = MagicMock()
         self.mock_client.get_service.return_value = self.mock_ga_service
         self.customer_id = "1234567890"
-        self.captured_output = StringIO()
-        sys.stdout = self.captured_output
-
-    def tearDown(self):
-        sys.stdout = sys.__stdout__
 
     def test_main_success(self):
-        mock_row = MagicMock()
-        mock_row.change_status.resource_name = "customers/123/campaigns/456"
-        mock_row.change_status.last_change_date_time = "2026-02-24 10:00:00"
-        mock_row.change_status.resource_type.name = "CAMPAIGN"
-        mock_row.change_status.resource_status.name = "ADDED"
+        self.mock_ga_service.search.return_value = [_CHANGE_ROW]
 
-        mock_batch = MagicMock()
-        mock_batch.results = [mock_row]
+        buf = StringIO()
+        with redirect_stdout(buf):
+            main(self.mock_client, self.customer_id, "2026-02-17", "2026-02-24")
 
-        self.mock_ga_service.search_stream.return_value = [mock_batch]
-
-        main(self.mock_client, self.customer_id, "2026-02-17", "2026-02-24")
-
-        self.mock_ga_service.search_stream.assert_called_once()
-        output = self.captured_output.getvalue()
+        self.mock_ga_service.search.assert_called_once()
+        query = self.mock_ga_service.search.call_args.kwargs["query"]
+        self.assertIn(
+            "WHERE change_status.last_change_date_time BETWEEN '2026-02-17' AND '2026-02-24'\n",
+            query,
+        )
+        output = buf.getvalue()
         self.assertIn("CAMPAIGN", output)
         self.assertIn("ADDED", output)
         self.assertIn("customers/123/campaigns/456", output)
+        self.assertTrue(output.endswith(
+            f"{'2026-02-24 10:00:00':<25} | {'CAMPAIGN':<20} | {'ADDED':<15} | "
+            "customers/123/campaigns/456\n"
+        ))
 
     def test_main_google_ads_exception(self):
-        mock_failure = MagicMock()
-        mock_failure.errors = [MagicMock(message="Error details")]
-        
-        self.mock_ga_service.search_stream.side_effect = GoogleAdsException(
-            error=MagicMock(),
-            failure=mock_failure,
-            request_id="test_request_id",
-            call=MagicMock(),
-        )
+        self.mock_ga_service.search.side_effect = canned_google_ads_exception()
 
-        main(self.mock_client, self.customer_id, "2026-02-17", "2026-02-24")
-        self.assertIn("Error (Request ID test_request_id): Error details", self.captured_output.getvalue())
+        buf = StringIO()
+        with redirect_stdout(buf):
+            main(self.mock_client, self.customer_id, "2026-02-17", "2026-02-24")
+        self.assertIn("Error (Request ID test_request_id): Error details", buf.getvalue())
 
 
 if __name__ == "__main__":
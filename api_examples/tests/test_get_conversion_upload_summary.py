@@ -12,75 +12,61 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import sys
-import os
-
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
-
 import unittest
+from contextlib import redirect_stdout
+from types import SimpleNamespace
 from unittest.mock import MagicMock
 from io import StringIO
 
-from google.ads.googleads.errors import GoogleAdsException
-from google.ads.googleads.client import GoogleAdsClient
+from api_examples.tests._helpers import canned_google_ads_exception
 
 # Import functions from the script
 from api_examples.get_conversion_upload_summary import main
 
 
+# A read-only summary batch, built once at import and shared by the tests.
+_CLIENT_SUMMARY_BATCH = SimpleNamespace(results=[
+    SimpleNamespace(offline_conversion_upload_client_summary=SimpleNamespace(
+        client=SimpleNamespace(name="GOOGLE_ADS_API"),
+        status=SimpleNamespace(name="SUCCESS"),
+        total_event_count=10,
+        successful_event_count=10,
+        daily_summaries=(
+            SimpleNamespace(
+                upload_date="2026-02-24", successful_count=10, failed_count=0, pending_count=0
+            ),
+        ),
+    ))
+])
+
+
 class TestGetConversionUploadSummary(unittest.TestCase):
     def setUp(self):
-        self.mock_client = MagicMock(spec=GoogleAdsClient)
         self.mock_ga_service = MagicMock()
-        self.mock_client.get_service.return_value = self.mock_ga_service
+        # Only get_service is used, so a plain object carries it.
+        self.mock_client = SimpleNamespace(
+            get_service=MagicMock(return_value=self.mock_ga_service)
+        )
         self.customer_id = "1234567890"
-        self.captured_output = StringIO()
-        sys.stdout = self.captured_output
-
-    def tearDown(self):
-        sys.stdout = sys.__stdout__
 
     def test_main_success(self):
-        mock_row = MagicMock()
-        mock_summary = mock_row.offline_conversion_upload_client_summary
-        mock_summary.client.name = "GOOGLE_ADS_API"
-        mock_summary.status.name = "SUCCESS"
-        mock_summary.total_event_count = 10
-        mock_summary.successful_event_count = 10
-        
-        mock_ds = MagicMock()
-        mock_ds.upload_date = "2026-02-24"
-        mock_ds.successful_count = 10
-        mock_ds.failed_count = 0
-        mock_ds.pending_count = 0
-        mock_summary.daily_summaries = [mock_ds]
-
-        mock_batch = MagicMock()
-        mock_batch.results = [mock_row]
+        self.mock_ga_service.search_stream.return_value = [_CLIENT_SUMMARY_BATCH]
 
-        self.mock_ga_service.search_stream.return_value = [mock_batch]
-
-        main(self.mock_client, self.customer_id)
+        with redirect_stdout(StringIO()) as out:
+            main(self.mock_client, self.customer_id)
 
         self.mock_ga_service.search_stream.assert_called_once()
-        output = self.captured_output.getvalue()
+        output = out.getvalue()
         self.assertIn("Client: GOOGLE_ADS_API, Status: SUCCESS", output)
         self.assertIn("Total: 10, Success: 10", output)
         self.assertIn("2026-02-24: 10/10 successful", output)
 
     def test_main_google_ads_exception(self):
-        mock_error = MagicMock()
-        mock_error.code.return_value.name = "REQUEST_ERROR"
-        
-        self.mock_ga_service.search_stream.side_effect = GoogleAdsException(
-            error=mock_error,
-            failure=MagicMock(errors=[MagicMock(message="Error details")]),
-            request_id="test_request_id",
-            call=MagicMock(),
-        )
+        self.mock_ga_service.search_stream.side_effect = canned_google_ads_exception()
 
-        main(self.mock_client, self.customer_id)
-        self.assertIn("Request ID test_request_id failed: REQUEST_ERROR", self.captured_output.getvalue())
+        with redirect_stdout(StringIO()) as out:
+            main(self.mock_client, self.customer_id)
+        self.assertIn("Request ID test_request_id failed: REQUEST_ERROR", out.getvalue())
 
 
 if __name__ == "__main__":
@@ -13,32 +13,178 @@
 # limitations under the License.
 
 # Copyright 2026 Google LLC
-import sys
 import os
+import tempfile
 import unittest
-from unittest.mock import MagicMock
+from contextlib import redirect_stdout
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
 from io import StringIO
 
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from api_examples.get_geo_targets import _GEO_CACHE_MAX_AGE_SECONDS, main
+
+
+def _criterion_row(campaign_name, criterion_id, negative=False):
+    """Returns a read-only campaign_criterion row."""
+    return SimpleNamespace(
+        campaign=SimpleNamespace(name=campaign_name),
+        campaign_criterion=SimpleNamespace(criterion_id=criterion_id, negative=negative),
+    )
+
+
+def _geo_row(geo_id, canonical_name):
+    """Returns a read-only geo_target_constant row."""
+    return SimpleNamespace(
+        geo_target_constant=SimpleNamespace(id=geo_id, canonical_name=canonical_name)
+    )
+
+
+def _geo_batch_for(query):
+    """Answers a geo_target_constant query with one row per requested ID."""
+    ids = query.split("IN (")[1].rstrip(")").split(", ")
+    return SimpleNamespace(results=[
+        _geo_row(int(geo_id), f"Location {geo_id}") for geo_id in ids
+    ])
+
+
+def _answer_queries(criteria_batch, geo_queries):
+    """Returns a search_stream stand-in that records each geo query it answers."""
+    def search_stream(customer_id, query):
+        # Geo lookups are the only queries that open with this prefix, so a
+        # startswith check routes each call without scanning the whole query.
+        if query.startswith("SELECT geo_target_constant"):
+            geo_queries.append(query)
+            return [_geo_batch_for(query)]
+        return [criteria_batch]
+
+    return search_stream
+
+
+# Read-only batches, built once at import and shared by the tests.
+_SHARED_CRITERIA_BATCH = SimpleNamespace(results=[
+    _criterion_row("Campaign A", 2840),
+    _criterion_row("Campaign B", 2840),
+    _criterion_row("Campaign C", 9999),
+])
+_US_GEO_BATCH = SimpleNamespace(results=[_geo_row(2840, "United States")])
+_FIVE_CRITERIA_BATCH = SimpleNamespace(
+    results=[_criterion_row(f"Campaign {i}", i) for i in range(1, 6)]
+)
+_TWO_CRITERIA_BATCH = SimpleNamespace(
+    results=[_criterion_row("Campaign A", 2840), _criterion_row("Campaign B", 2250)]
+)
 
-from api_examples.get_geo_targets import main
 
 class TestGetGeoTargets(unittest.TestCase):
     def setUp(self):
-        self.mock_client = MagicMock()
         self.mock_ga_service = MagicMock()
-        self.mock_client.get_service.return_value = self.mock_ga_service
-        self.captured_output = StringIO()
-        self.sys_stdout = sys.stdout
-        sys.stdout = self.captured_output
+        # Only get_service is used, so a plain object carries it.
+        self.mock_client = SimpleNamespace(
+            get_service=MagicMock(return_value=self.mock_ga_service)
+        )
 
-    def tearDown(self):
-        sys.stdout = self.sys_stdout
+    def assertLinesInOrder(self, output, expected):
+        # One forward scan over the output checks every line and their order.
+        pos = 0
+        for line in expected:
+            idx = output.find(line, pos)
+            self.assertNotEqual(idx, -1, f"{line!r} not found in order")
+            pos = idx + len(line)
 
     def test_main_no_geo_targets(self):
         self.mock_ga_service.search_stream.return_value = []
-        main(self.mock_client, "123")
-        self.assertIn("No geo targets found.", self.captured_output.getvalue())
+        with redirect_stdout(StringIO()) as out:
+            main(self.mock_client, "123")
+        self.assertIn("No geo targets found.", out.getvalue())
+
+    def test_main_resolves_shared_locations_once(self):
+        self.mock_ga_service.search_stream.side_effect = [
+            [_SHARED_CRITERIA_BATCH],
+            [_US_GEO_BATCH],
+        ]
+
+        with redirect_stdout(StringIO()) as out:
+            main(self.mock_client, "123")
+
+        self.assertEqual(self.mock_ga_service.search_stream.call_count, 2)
+        geo_query = self.mock_ga_service.search_stream.call_args.kwargs["query"]
+        self.assertIn("geo_target_constant.id IN (", geo_query)
+        self.assertEqual(geo_query.count("2840"), 1)
+        output = out.getvalue()
+        self.assertLinesInOrder(output, [
+            f"{'Campaign A':<25} | {'United States':<30} | False",
+            f"{'Campaign B':<25} | {'United States':<30} | False",
+            f"{'Campaign C':<25} | {'Unknown':<30} | False",
+        ])
+
+    def test_main_chunks_location_lookups(self):
+        geo_queries = []
+        self.mock_ga_service.search_stream.side_effect = _answer_queries(
+            _FIVE_CRITERIA_BATCH, geo_queries
+        )
+
+        with patch("api_examples.get_geo_targets._GEO_IDS_PER_QUERY", 2), \
+                redirect_stdout(StringIO()) as out:
+            main(self.mock_client, "123")
+
+        self.assertEqual(len(geo_queries), 3)
+        output = out.getvalue()
+        self.assertLinesInOrder(output, [
+            f"{f'Campaign {criterion_id}':<25} | {f'Location {criterion_id}':<30}"
+            for criterion_id in range(1, 6)
+        ])
+
+    def test_main_reuses_cached_locations(self):
+        geo_queries = []
+        self.mock_ga_service.search_stream.side_effect = _answer_queries(
+            _TWO_CRITERIA_BATCH, geo_queries
+        )
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache_path = os.path.join(tmp_dir, "gads", "geo.sqlite")
+            with redirect_stdout(StringIO()):
+                main(self.mock_client, "123", cache_path)
+            with redirect_stdout(StringIO()) as out:
+                main(self.mock_client, "123", cache_path)
+
+        self.assertEqual(len(geo_queries), 1)
+        output = out.getvalue()
+        self.assertLinesInOrder(output, [
+            f"{'Campaign A':<25} | {'Location 2840':<30} | False",
+            f"{'Campaign B':<25} | {'Location 2250':<30} | False",
+        ])
+
+    def test_main_refetches_stale_cached_locations(self):
+        geo_queries = []
+        self.mock_ga_service.search_stream.side_effect = _answer_queries(
+            _TWO_CRITERIA_BATCH, geo_queries
+        )
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache_path = os.path.join(tmp_dir, "geo.sqlite")
+            with patch("api_examples.get_geo_targets.time.time", return_value=0.0):
+                with redirect_stdout(StringIO()):
+                    main(self.mock_client, "123", cache_path)
+            with patch(
+                "api_examples.get_geo_targets.time.time",
+                return_value=_GEO_CACHE_MAX_AGE_SECONDS + 1.0,
+            ):
+                with redirect_stdout(StringIO()):
+                    main(self.mock_client, "123", cache_path)
+
+        self.assertEqual(len(geo_queries), 2)
+
+    def test_main_without_cache_path_writes_no_cache(self):
+        self.mock_ga_service.search_stream.side_effect = _answer_queries(
+            _TWO_CRITERIA_BATCH, []
+        )
+
+        with patch("api_examples.get_geo_targets._open_geo_cache") as mock_open_cache:
+            with redirect_stdout(StringIO()):
+                main(self.mock_client, "123")
+
+        mock_open_cache.assert_not_called()
+
 
 if __name__ == "__main__":
     unittest.main()
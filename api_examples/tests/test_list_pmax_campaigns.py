@@ -12,33 +12,32 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import sys
-import os
-
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
-
 import unittest
+from contextlib import redirect_stdout
+from types import SimpleNamespace
 from unittest.mock import MagicMock
 from io import StringIO
 
-from google.ads.googleads.errors import GoogleAdsException
-from google.ads.googleads.client import GoogleAdsClient
+from api_examples.tests._helpers import canned_google_ads_exception
 
 # Import the main function from the script
 from api_examples.list_pmax_campaigns import main
 
 
+def _raising_stream(exc):
+    """Yields nothing and raises exc on first iteration, as a failed stream does."""
+    raise exc
+    yield
+
+
 class TestListPMaxCampaigns(unittest.TestCase):
     def setUp(self):
-        self.mock_client = MagicMock(spec=GoogleAdsClient)
         self.mock_ga_service = MagicMock()
-        self.mock_client.get_service.return_value = self.mock_ga_service
+        # Only get_service is used, so a plain object carries it.
+        self.mock_client = SimpleNamespace(
+            get_service=MagicMock(return_value=self.mock_ga_service)
+        )
         self.customer_id = "1234567890"
-        self.captured_output = StringIO()
-        sys.stdout = self.captured_output
-
-    def tearDown(self):
-        sys.stdout = sys.__stdout__
 
     def test_main_successful_call(self):
         # Mock the stream and its results
@@ -57,34 +56,31 @@ class TestListPMaxCampaigns(unittest.TestCase):
 
         self.mock_ga_service.search_stream.return_value = [mock_batch]
 
-        main(self.mock_client, self.customer_id)
+        with redirect_stdout(StringIO()) as out:
+            main(self.mock_client, self.customer_id)
 
         # Assert that search_stream was called with the correct arguments
         self.mock_ga_service.search_stream.assert_called_once()
+        query = self.mock_ga_service.search_stream.call_args.kwargs["query"]
+        self.assertIn("PARAMETERS\n            omit_unselected_resource_names = true", query)
         
         # Assert that the output contains the expected information
-        output = self.captured_output.getvalue()
+        output = out.getvalue()
         self.assertIn("12345", output)
         self.assertIn("Test PMax Campaign", output)
         self.assertIn("ENABLED", output)
         self.assertIn("ELIGIBLE", output)
 
     def test_main_google_ads_exception(self):
-        mock_error = MagicMock()
-        mock_error.code.return_value.name = "REQUEST_ERROR"
-        
-        self.mock_ga_service.search_stream.side_effect = GoogleAdsException(
-            error=mock_error,
-            failure=MagicMock(errors=[MagicMock(message="Error details")]),
-            request_id="test_request_id",
-            call=MagicMock(),
+        self.mock_ga_service.search_stream.return_value = _raising_stream(
+            canned_google_ads_exception()
         )
 
-        with self.assertRaises(SystemExit) as cm:
+        with self.assertRaises(SystemExit) as cm, redirect_stdout(StringIO()) as out:
             main(self.mock_client, self.customer_id)
 
         self.assertEqual(cm.exception.code, 1)
-        output = self.captured_output.getvalue()
+        output = out.getvalue()
         self.assertIn("Request ID test_request_id failed: REQUEST_ERROR", output)
 
 
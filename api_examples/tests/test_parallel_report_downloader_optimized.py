@@ -13,20 +13,42 @@
 # limitations under the License.
 
 # Copyright 2026 Google LLC
-import sys
-import os
+import asyncio
+import logging
 import unittest
-from unittest.mock import MagicMock
+from datetime import datetime
+from types import SimpleNamespace
+from logging.handlers import QueueHandler
+from unittest.mock import AsyncMock, MagicMock, patch
 
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from google.ads.googleads.errors import GoogleAdsException
+
+from api_examples.parallel_report_downloader_optimized import (
+    ReportResult,
+    _get_date_range_strings,
+    _queued_logging,
+    fetch_report_threaded,
+    main,
+)
+
+
+class _FrozenDatetime(datetime):
+    """Pins datetime.now() so the report date window is deterministic."""
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2025, 1, 15, 23, 59, 59)
 
-from api_examples.parallel_report_downloader_optimized import fetch_report_threaded
 
 class TestParallelDownloader(unittest.TestCase):
     def setUp(self):
-        self.mock_client = MagicMock()
         self.mock_ga_service = MagicMock()
-        self.mock_client.get_service.return_value = self.mock_ga_service
+        # main only calls get_service and may set login_customer_id, so a
+        # plain object carries both.
+        self.mock_client = SimpleNamespace(
+            get_service=MagicMock(return_value=self.mock_ga_service),
+            login_customer_id=None,
+        )
         self.customer_id = "1234567890"
 
     def test_fetch_report_threaded_logging(self):
@@ -36,10 +58,149 @@ class TestParallelDownloader(unittest.TestCase):
         self.mock_ga_service.search_stream.return_value = [mock_batch]
 
         with self.assertLogs("api_examples.parallel_report_downloader_optimized", level="INFO") as cm:
-            fetch_report_threaded(self.mock_client, self.customer_id, "SELECT 1 FROM campaign", "LogTest")
+            fetch_report_threaded(self.mock_ga_service, self.customer_id, "SELECT 1 FROM campaign", "LogTest")
             
         self.assertTrue(any("Fetching for customer" in output for output in cm.output))
         self.assertTrue(any("Completed. Found 1 rows." in output for output in cm.output))
 
+    def test_fetch_report_threaded_streams_rows_to_callback(self):
+        rows = [MagicMock(), MagicMock(), MagicMock()]
+        self.mock_ga_service.search_stream.return_value = [
+            MagicMock(results=rows[:2]),
+            MagicMock(results=rows[2:]),
+        ]
+        seen = []
+
+        with self.assertLogs("api_examples.parallel_report_downloader_optimized", level="INFO"):
+            result = fetch_report_threaded(
+                self.mock_ga_service, self.customer_id, "SELECT 1 FROM campaign", "Stream",
+                on_row=seen.append,
+            )
+
+        self.assertEqual(seen, rows)
+        self.assertEqual(result, {"customer_id": self.customer_id, "row_count": 3})
+
+    def test_get_date_range_strings_spans_seven_days(self):
+        with patch(
+            "api_examples.parallel_report_downloader_optimized.datetime", _FrozenDatetime
+        ):
+            self.assertEqual(_get_date_range_strings(), ("2025-01-08", "2025-01-15"))
+
+    def _quota_error(self):
+        error = MagicMock()
+        error.code.return_value.name = "RESOURCE_EXHAUSTED"
+        return GoogleAdsException(
+            error=error, failure=MagicMock(), request_id="quota", call=MagicMock()
+        )
+
+    def test_fetch_report_threaded_retries_quota_errors(self):
+        self.mock_ga_service.search_stream.side_effect = [
+            self._quota_error(),
+            self._quota_error(),
+            [MagicMock(results=[MagicMock()])],
+        ]
+
+        with patch("api_examples.parallel_report_downloader_optimized.time.sleep") as mock_sleep, \
+                self.assertLogs("api_examples.parallel_report_downloader_optimized", level="INFO"):
+            result = fetch_report_threaded(
+                self.mock_ga_service, self.customer_id, "SELECT 1 FROM campaign", "Retry"
+            )
+
+        self.assertEqual(result["row_count"], 1)
+        self.assertEqual(mock_sleep.call_count, 2)
+        first_delay, second_delay = (c.args[0] for c in mock_sleep.call_args_list)
+        self.assertTrue(1.0 <= first_delay < 2.0)
+        self.assertTrue(2.0 <= second_delay < 3.0)
+
+    def test_fetch_report_threaded_does_not_retry_after_rows(self):
+        def stream():
+            yield MagicMock(results=[MagicMock()])
+            raise self._quota_error()
+
+        self.mock_ga_service.search_stream.return_value = stream()
+
+        with patch("api_examples.parallel_report_downloader_optimized.time.sleep") as mock_sleep, \
+                self.assertLogs("api_examples.parallel_report_downloader_optimized", level="INFO"), \
+                self.assertRaises(GoogleAdsException):
+            fetch_report_threaded(
+                self.mock_ga_service, self.customer_id, "SELECT 1 FROM campaign", "Retry",
+                on_row=lambda row: None,
+            )
+
+        mock_sleep.assert_not_called()
+        self.mock_ga_service.search_stream.assert_called_once()
+
+    def test_main_shares_one_service_across_workers(self):
+        self.mock_ga_service.search_stream.return_value = []
+
+        with patch(
+            "api_examples.parallel_report_downloader_optimized.GoogleAdsClient.load_from_storage",
+            return_value=self.mock_client,
+        ) as mock_load, self.assertLogs("api_examples.parallel_report_downloader_optimized", level="INFO") as cm:
+            results = main(["111", "222", "333"], None, "v23")
+
+        mock_load.assert_called_once_with(version="v23", use_proto_plus=False)
+
+        self.mock_client.get_service.assert_called_once_with("GoogleAdsService")
+        self.assertTrue(any("Finished processing Campaign_Performance for customer 333" in output for output in cm.output))
+        self.assertEqual(self.mock_ga_service.search_stream.call_count, 3)
+        self.assertEqual(
+            sorted(results, key=lambda r: r.customer_id),
+            [ReportResult("Campaign_Performance", cid, 0) for cid in ("111", "222", "333")],
+        )
+
+    def test_queued_logging_restores_logger(self):
+        module_logger = logging.getLogger("api_examples.parallel_report_downloader_optimized")
+        handlers = list(module_logger.handlers)
+        propagate = module_logger.propagate
+
+        with _queued_logging():
+            self.assertFalse(module_logger.propagate)
+            self.assertIsInstance(module_logger.handlers[-1], QueueHandler)
+
+        self.assertEqual(module_logger.handlers, handlers)
+        self.assertEqual(module_logger.propagate, propagate)
+
+    def test_main_use_async_gathers_reports(self):
+        mock_row = MagicMock()
+
+        async def stream(rows):
+            yield MagicMock(results=rows)
+
+        async def search_stream(customer_id, query):
+            if customer_id == "222":
+                raise RuntimeError("stream reset")
+            return stream([mock_row])
+
+        self.mock_ga_service.search_stream = AsyncMock(side_effect=search_stream)
+        # grpc.aio channels are bound to the loop they are created on, so the
+        # async service must be looked up once asyncio.run has started one.
+        loops = []
+
+        def get_service(*args, **kwargs):
+            loops.append(asyncio.get_running_loop())
+            return self.mock_ga_service
+
+        self.mock_client.get_service.side_effect = get_service
+
+        with patch(
+            "api_examples.parallel_report_downloader_optimized.GoogleAdsClient.load_from_storage",
+            return_value=self.mock_client,
+        ), self.assertLogs("api_examples.parallel_report_downloader_optimized", level="INFO") as cm:
+            results = main(["111", "222"], None, "v23", use_async=True)
+
+        self.mock_client.get_service.assert_called_once_with("GoogleAdsService", is_async=True)
+        self.assertEqual(len(loops), 1)
+        self.assertEqual(results[0], ReportResult("Campaign_Performance", "111", 1))
+        self.assertEqual(results[1].customer_id, "222")
+        self.assertIsInstance(results[1].exception, RuntimeError)
+        self.assertTrue(any("Completed. Found 1 rows." in output for output in cm.output))
+        self.assertTrue(
+            any("Finished processing Campaign_Performance for customer 111" in output for output in cm.output)
+        )
+        self.assertTrue(
+            any("Report Campaign_Performance for customer 222 failed." in output for output in cm.output)
+        )
+
 if __name__ == "__main__":
     unittest.main()
@@ -12,19 +12,32 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import sys
-import os
-
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
-
+import enum
 import unittest
+from contextlib import redirect_stdout
+from types import SimpleNamespace
 from unittest.mock import MagicMock
 from io import StringIO
 
-from google.ads.googleads.errors import GoogleAdsException
+from api_examples.tests._helpers import canned_google_ads_exception
 
 # Import the main function from the script
-from api_examples.remove_automatically_created_assets import main
+from api_examples.remove_automatically_created_assets import RemovalSpec, main
+
+
+AssetFieldType = enum.IntEnum(
+    "AssetFieldType", [("UNSPECIFIED", 0), ("UNKNOWN", 1), ("HEADLINE", 2), ("DESCRIPTION", 3)]
+)
+
+
+def _removal_response(partial_failure_message=""):
+    """Returns a response shaped like RemoveCampaignAutomaticallyCreatedAssetResponse.
+
+    The real message has no results field, so neither does this one.
+    """
+    return SimpleNamespace(
+        partial_failure_error=SimpleNamespace(message=partial_failure_message)
+    )
 
 
 class TestRemoveAutomaticallyCreatedAssets(unittest.TestCase):
@@ -32,52 +45,92 @@ class TestRemoveAutomaticallyCreatedAssets(unittest.TestCase):
         self.mock_client = MagicMock() # Don't use spec=GoogleAdsClient to allow enums attribute
         self.mock_removal_service = MagicMock()
         self.mock_campaign_service = MagicMock()
-        
-        def get_service_side_effect(name):
-            if name == "AutomaticallyCreatedAssetRemovalService":
-                return self.mock_removal_service
-            if name == "CampaignService":
-                return self.mock_campaign_service
-            return MagicMock()
-
-        self.mock_client.get_service.side_effect = get_service_side_effect
-        self.mock_client.get_type.return_value = MagicMock()
-        self.mock_client.enums.AssetFieldTypeEnum.AssetFieldType.HEADLINE = 1
+        services = {
+            "AutomaticallyCreatedAssetRemovalService": self.mock_removal_service,
+            "CampaignService": self.mock_campaign_service,
+        }
+
+        self.mock_client.configure_mock(**{
+            "get_service.side_effect": services.__getitem__,
+            "get_type.return_value": MagicMock(),
+            "enums.AssetFieldTypeEnum.AssetFieldType": AssetFieldType,
+        })
         
         self.customer_id = "1234567890"
         self.campaign_id = "111222333"
         self.asset_rn = "customers/123/assets/456"
         self.field_type = "HEADLINE"
-        
-        self.captured_output = StringIO()
-        sys.stdout = self.captured_output
-
-    def tearDown(self):
-        sys.stdout = sys.__stdout__
+        self.removals = [RemovalSpec(self.campaign_id, self.asset_rn, self.field_type)]
 
     def test_main_successful_removal(self):
-        mock_response = MagicMock()
-        mock_response.results = [MagicMock()]
-        self.mock_removal_service.remove_campaign_automatically_created_asset.return_value = mock_response
+        self.mock_removal_service.remove_campaign_automatically_created_asset.return_value = (
+            _removal_response()
+        )
+
+        with redirect_stdout(StringIO()) as out:
+            main(self.mock_client, self.customer_id, self.removals)
+
+        self.mock_removal_service.remove_campaign_automatically_created_asset.assert_called_once()
+        self.assertIn("Removed 1 assets.", out.getvalue())
+
+    def test_main_batches_removals_into_one_request(self):
+        self.mock_client.get_type.side_effect = lambda name: MagicMock()
+        self.mock_campaign_service.campaign_path.side_effect = (
+            lambda customer_id, campaign_id: f"customers/{customer_id}/campaigns/{campaign_id}"
+        )
+        self.mock_removal_service.remove_campaign_automatically_created_asset.return_value = (
+            _removal_response()
+        )
 
-        main(self.mock_client, self.customer_id, self.campaign_id, self.asset_rn, self.field_type)
+        with redirect_stdout(StringIO()) as out:
+            main(self.mock_client, self.customer_id, [
+                RemovalSpec("1", "customers/123/assets/10", "headline"),
+                RemovalSpec("2", "customers/123/assets/20", "DESCRIPTION"),
+            ])
 
         self.mock_removal_service.remove_campaign_automatically_created_asset.assert_called_once()
-        self.assertIn("Removed 1 assets.", self.captured_output.getvalue())
+        kwargs = self.mock_removal_service.remove_campaign_automatically_created_asset.call_args.kwargs
+        self.assertTrue(kwargs["partial_failure"])
+        operations = kwargs["operations"]
+        self.assertEqual(
+            [(op.campaign, op.asset, op.field_type) for op in operations],
+            [
+                ("customers/1234567890/campaigns/1", "customers/123/assets/10", AssetFieldType.HEADLINE),
+                ("customers/1234567890/campaigns/2", "customers/123/assets/20", AssetFieldType.DESCRIPTION),
+            ],
+        )
+        self.assertEqual(out.getvalue(), "Removed 2 assets.\n")
+
+    def test_main_reports_partial_failure(self):
+        self.mock_removal_service.remove_campaign_automatically_created_asset.return_value = (
+            _removal_response("Asset not found.")
+        )
+
+        with redirect_stdout(StringIO()) as out:
+            main(self.mock_client, self.customer_id, self.removals)
+
+        self.assertEqual(out.getvalue(), "Some removals failed: Asset not found.\n")
+
+    def test_main_invalid_field_type_lists_valid_names(self):
+        with self.assertRaises(SystemExit), redirect_stdout(StringIO()) as out:
+            main(self.mock_client, self.customer_id, [
+                RemovalSpec(self.campaign_id, self.asset_rn, "unknown"),
+            ])
+
+        self.assertEqual(
+            out.getvalue(),
+            "Invalid field type 'unknown'. Valid field types: HEADLINE, DESCRIPTION\n",
+        )
+        self.mock_removal_service.remove_campaign_automatically_created_asset.assert_not_called()
 
     def test_main_google_ads_exception(self):
-        mock_error = MagicMock()
-        mock_error.code.return_value.name = "REQUEST_ERROR"
-        
-        self.mock_removal_service.remove_campaign_automatically_created_asset.side_effect = GoogleAdsException(
-            error=mock_error,
-            failure=MagicMock(errors=[MagicMock(message="Error details")]),
-            request_id="test_request_id",
-            call=MagicMock(),
+        self.mock_removal_service.remove_campaign_automatically_created_asset.side_effect = (
+            canned_google_ads_exception()
         )
 
-        main(self.mock_client, self.customer_id, self.campaign_id, self.asset_rn, self.field_type)
-        self.assertIn("Request ID test_request_id failed: REQUEST_ERROR", self.captured_output.getvalue())
+        with redirect_stdout(StringIO()) as out:
+            main(self.mock_client, self.customer_id, self.removals)
+        self.assertIn("Request ID test_request_id failed: REQUEST_ERROR", out.getvalue())
 
 
 if __name__ == "__main__":
@@ -12,77 +12,74 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import sys
-import os
-
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
-
 import unittest
+from contextlib import redirect_stdout
 from unittest.mock import MagicMock
 from io import StringIO
 
-from google.ads.googleads.errors import GoogleAdsException
-from google.ads.googleads.client import GoogleAdsClient
+from api_examples.tests._helpers import canned_google_ads_exception
 
 # Import the main function from the script
 from api_examples.target_campaign_with_user_list import main
 
 
 class TestTargetCampaignWithUserList(unittest.TestCase):
+    _CAMPAIGN_PATH = "customers/123/campaigns/456"
+    _USER_LIST_PATH = "customers/123/userLists/789"
+
+    @classmethod
+    def setUpClass(cls):
+        # The script only calls get_service and get_type, so those names are
+        # the whole spec; the client is built once and rewired per test.
+        cls._client = MagicMock(spec=["get_service", "get_type"])
+
     def setUp(self):
-        self.mock_client = MagicMock(spec=GoogleAdsClient)
+        self._client.reset_mock()
+        self.mock_client = self._client
         self.mock_criterion_service = MagicMock()
         self.mock_campaign_service = MagicMock()
+        self.mock_campaign_service.campaign_path.return_value = self._CAMPAIGN_PATH
         self.mock_user_list_service = MagicMock()
-        
-        def get_service_side_effect(name):
-            if name == "CampaignCriterionService":
-                return self.mock_criterion_service
-            if name == "CampaignService":
-                return self.mock_campaign_service
-            if name == "UserListService":
-                return self.mock_user_list_service
-            return MagicMock()
-
-        self.mock_client.get_service.side_effect = get_service_side_effect
-        self.mock_client.get_type.return_value = MagicMock()
+        self.mock_user_list_service.user_list_path.return_value = self._USER_LIST_PATH
+        services = {
+            "CampaignCriterionService": self.mock_criterion_service,
+            "CampaignService": self.mock_campaign_service,
+            "UserListService": self.mock_user_list_service,
+        }
+
+        self.mock_client.configure_mock(**{
+            "get_service.side_effect": services.__getitem__,
+            "get_type.return_value": MagicMock(),
+        })
         
         self.customer_id = "1234567890"
         self.campaign_id = "111222333"
         self.user_list_id = "444555666"
-        
-        self.captured_output = StringIO()
-        sys.stdout = self.captured_output
-
-    def tearDown(self):
-        sys.stdout = sys.__stdout__
 
     def test_main_successful_targeting(self):
         mock_response = MagicMock()
         mock_response.results = [MagicMock(resource_name="customers/123/campaignCriteria/101")]
         self.mock_criterion_service.mutate_campaign_criteria.return_value = mock_response
 
-        main(self.mock_client, self.customer_id, self.campaign_id, self.user_list_id)
+        with redirect_stdout(StringIO()) as out:
+            main(self.mock_client, self.customer_id, self.campaign_id, self.user_list_id)
 
         self.mock_criterion_service.mutate_campaign_criteria.assert_called_once()
-        self.assertIn("Created criterion: customers/123/campaignCriteria/101", self.captured_output.getvalue())
+        (op,) = self.mock_criterion_service.mutate_campaign_criteria.call_args.kwargs["operations"]
+        self.assertEqual(op.create.campaign, self._CAMPAIGN_PATH)
+        self.assertEqual(op.create.user_list.user_list, self._USER_LIST_PATH)
+        self.assertIn("Created criterion: customers/123/campaignCriteria/101", out.getvalue())
 
     def test_main_google_ads_exception(self):
-        mock_error = MagicMock()
-        mock_error.code.return_value.name = "REQUEST_ERROR"
-        
-        self.mock_criterion_service.mutate_campaign_criteria.side_effect = GoogleAdsException(
-            error=mock_error,
-            failure=MagicMock(errors=[MagicMock(message="Error details")]),
-            request_id="test_request_id",
-            call=MagicMock(),
+        self.mock_criterion_service.mutate_campaign_criteria.side_effect = (
+            canned_google_ads_exception()
         )
 
-        with self.assertRaises(SystemExit) as cm:
+        with self.assertRaises(SystemExit) as cm, redirect_stdout(StringIO()) as out:
             main(self.mock_client, self.customer_id, self.campaign_id, self.user_list_id)
 
         self.assertEqual(cm.exception.code, 1)
-        self.assertIn("Request ID test_request_id failed: REQUEST_ERROR", self.captured_output.getvalue())
+        self.assertIn("Request ID test_request_id failed: REQUEST_ERROR", out.getvalue())
 
 
 if __name__ == "__main__":
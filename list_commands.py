@@ -15,6 +15,19 @@
 import pathlib
 import tomllib
 import sys
+from typing import Optional, Tuple
+
+
+def _load_command(file_path: pathlib.Path) -> Optional[Tuple[str, str]]:
+    """Returns a command's name and description, or None if its file is unreadable."""
+    try:
+        with file_path.open("rb") as f:
+            data = tomllib.load(f)
+    except Exception as e:
+        print(f"Error reading {file_path.name}: {e}", file=sys.stderr)
+        return None
+    return file_path.stem, data.get("description", "No description found")
+
 
 def main():
     commands_dir = pathlib.Path(".gemini/commands")
@@ -23,7 +36,7 @@ def main():
         print(f"Directory not found: {commands_dir.absolute()}")
         sys.exit(1)
 
-    files = sorted(commands_dir.glob("*.toml"))
+    files = sorted(p for p in commands_dir.iterdir() if p.suffix == ".toml")
     
     if not files:
         print("No .toml files found in .gemini/commands")
@@ -32,13 +45,9 @@ def main():
     # Collect all commands and descriptions
     commands = []
     for file_path in files:
-        try:
-            with file_path.open("rb") as f:
-                data = tomllib.load(f)
-                description = data.get("description", "No description found")
-                commands.append((file_path.stem, description))
-        except Exception as e:
-            print(f"Error reading {file_path.name}: {e}", file=sys.stderr)
+        command = _load_command(file_path)
+        if command is not None:
+            commands.append(command)
 
     if not commands:
         return
@@ -48,9 +57,8 @@ def main():
     
     # Print aligned output
     # We add a few spaces gap between command and description
-    gap = 3
-    for name, description in commands:
-        print(f"{name:<{max_len + gap}}{description}")
+    width = max_len + 3
+    sys.stdout.write("".join(f"{name.ljust(width)}{description}\n" for name, description in commands))
 
 if __name__ == "__main__":
     main()
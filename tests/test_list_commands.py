@@ -0,0 +1,101 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import sys
+import os
+import pathlib
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from io import StringIO
+
+# Add the project root to sys.path so we can import list_commands
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(script_dir, ".."))
+sys.path.append(project_root)
+
+import list_commands  # noqa: E402
+
+
+class TestLoadCommand(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = pathlib.Path(tmp.name)
+
+    def load(self, contents):
+        path = self.dir / "cmd.toml"
+        path.write_text(contents)
+        with redirect_stderr(StringIO()) as err:
+            result = list_commands._load_command(path)
+        return result, err.getvalue()
+
+    def test_top_level_description(self):
+        result, err = self.load('description = "Explains code."\nprompt = """\nx\n"""\n')
+        self.assertEqual(result, ("cmd", "Explains code."))
+        self.assertEqual(err, "")
+
+    def test_description_in_indented_table_is_not_top_level(self):
+        result, err = self.load('  [tool]\ndescription = "Inner."\n')
+        self.assertEqual(result, ("cmd", "No description found"))
+        self.assertEqual(err, "")
+
+    def test_duplicate_description_is_reported(self):
+        result, err = self.load('description = "One."\ndescription = "Two."\n')
+        self.assertIsNone(result)
+        self.assertIn("Error reading cmd.toml:", err)
+
+    def test_malformed_file_after_description_is_reported(self):
+        result, err = self.load('description = "One."\nprompt = """\nunterminated\n')
+        self.assertIsNone(result)
+        self.assertIn("Error reading cmd.toml:", err)
+
+    def test_malformed_file_without_description_is_reported(self):
+        result, err = self.load('prompt = "unterminated\n')
+        self.assertIsNone(result)
+        self.assertIn("Error reading cmd.toml:", err)
+
+    def test_comment_only_file_has_default_description(self):
+        result, err = self.load("# Nothing here yet.\n")
+        self.assertEqual(result, ("cmd", "No description found"))
+        self.assertEqual(err, "")
+
+
+class TestMain(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        commands_dir = pathlib.Path(tmp.name, ".gemini", "commands")
+        commands_dir.mkdir(parents=True)
+        (commands_dir / "zeta.toml").write_text('description = "Last."\n')
+        (commands_dir / "alpha.toml").write_text('description = "First."\n')
+        (commands_dir / "broken.toml").write_text('description = "unterminated\n')
+        (commands_dir / "notes.txt").write_text('description = "Ignored."\n')
+        cwd = os.getcwd()
+        os.chdir(tmp.name)
+        self.addCleanup(os.chdir, cwd)
+
+    def test_lists_commands_sorted_and_reports_unreadable_files(self):
+        with redirect_stdout(StringIO()) as out, redirect_stderr(StringIO()) as err:
+            list_commands.main()
+
+        self.assertEqual(out.getvalue(), "alpha   First.\nzeta    Last.\n")
+        self.assertEqual(err.getvalue().count("Error reading"), 1)
+        self.assertTrue(err.getvalue().startswith("Error reading broken.toml:"))
+
+
+if __name__ == "__main__":
+    unittest.main()